@@ -13,8 +13,15 @@
 
     'depends': ['point_of_sale'],
     'data': [
+        # Security
+        'security/ir.model.access.csv',
+        # Data
+        'data/ir_cron.xml',
+        # Reports
+        'report/z_report.xml',
         # Views
         'views/pos_config.xml',
+        'views/pos_sales_daily_summary.xml',
     ],
     "assets": {
         "point_of_sale._assets_pos": [
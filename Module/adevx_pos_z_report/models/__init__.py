@@ -1,3 +1,4 @@
 
 from . import pos_config
 from . import pos_session
+from . import pos_sales_daily_summary
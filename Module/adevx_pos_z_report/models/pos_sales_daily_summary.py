@@ -0,0 +1,159 @@
+from odoo import api, fields, models
+
+SUMMARY_TOTALS = [
+    'orders_count', 'sales_total', 'refund_total', 'reversal_total', 'discounts_total',
+    'taxes_total', 'gross_total', 'gross_profit_total',
+]
+
+
+class PosSalesDailySummary(models.Model):
+    _name = 'pos.sales.daily.summary'
+    _description = 'POS Daily Sales Summary'
+    _order = 'date desc, config_id'
+
+    date = fields.Date(required=True, index=True)
+    config_id = fields.Many2one('pos.config', string='Point of Sale', required=True, index=True, ondelete='cascade')
+    company_id = fields.Many2one(related='config_id.company_id', store=True)
+    currency_id = fields.Many2one(related='config_id.currency_id')
+    session_ids = fields.Many2many('pos.session', string='Sessions', readonly=True)
+    orders_count = fields.Integer('Orders')
+    sales_total = fields.Monetary('Sales')
+    refund_total = fields.Monetary('Refunds')
+    reversal_total = fields.Monetary('Reversals')
+    discounts_total = fields.Monetary('Discounts')
+    taxes_total = fields.Monetary('Taxes')
+    gross_total = fields.Monetary('Gross')
+    gross_profit_total = fields.Monetary('Gross Profit')
+    tax_line_ids = fields.One2many('pos.sales.daily.summary.tax', 'summary_id', string='Taxes Detail')
+    payment_line_ids = fields.One2many('pos.sales.daily.summary.payment', 'summary_id', string='Payment Methods')
+
+    _sql_constraints = [
+        ('date_config_uniq', 'unique(date, config_id)', 'Only one daily summary per point of sale and day.'),
+    ]
+
+    @api.model
+    def _add_sessions(self, sessions):
+        """Add the Z-report figures of closed ``sessions`` to their daily summary
+
+        Sessions already counted in a summary are skipped, so closing
+        hooks can be replayed safely.
+        """
+        sessions = sessions.filtered(lambda s: s.state == 'closed')
+        counted = self.search([('session_ids', 'in', sessions.ids)]).session_ids
+        sessions -= counted
+        if not sessions:
+            return self
+        figures = sessions._get_z_report_figures()
+        summaries = self
+        for session in sessions:
+            date = fields.Date.context_today(session, timestamp=session.stop_at or fields.Datetime.now())
+            summary = self.search([('date', '=', date), ('config_id', '=', session.config_id.id)])
+            if not summary:
+                summary = self.create({'date': date, 'config_id': session.config_id.id})
+            summary._add_figures(session, figures[session.id])
+            summaries |= summary
+        return summaries
+
+    def _add_figures(self, session, session_figures):
+        self.ensure_one()
+        vals = {key: self[key] + session_figures[key] for key in SUMMARY_TOTALS}
+        vals['session_ids'] = [(4, session.id)]
+
+        tax_lines = {line.tax_id.id: line for line in self.tax_line_ids}
+        tax_commands = []
+        for tax in session_figures['taxes']:
+            line = tax_lines.get(tax['tax_id'])
+            if line:
+                tax_commands.append((1, line.id, {
+                    'net_total': line.net_total + tax['net_total'],
+                    'tax_total': line.tax_total + tax['tax_total'],
+                }))
+            else:
+                tax_commands.append((0, 0, {
+                    'tax_id': tax['tax_id'],
+                    'net_total': tax['net_total'],
+                    'tax_total': tax['tax_total'],
+                }))
+
+        payment_lines = {line.payment_method_id.id: line for line in self.payment_line_ids}
+        payment_commands = []
+        for payment in session_figures['payments_amount']:
+            if not payment['amount']:
+                continue
+            line = payment_lines.get(payment['payment_method_id'])
+            if line:
+                payment_commands.append((1, line.id, {'amount': line.amount + payment['amount']}))
+            else:
+                payment_commands.append((0, 0, {
+                    'payment_method_id': payment['payment_method_id'],
+                    'amount': payment['amount'],
+                }))
+
+        vals['tax_line_ids'] = tax_commands
+        vals['payment_line_ids'] = payment_commands
+        self.write(vals)
+
+    @api.model
+    def get_sales_summary(self, date_from, date_to, config_ids=None, domain=None):
+        """X/Z summary over several points of sale and days, read from the daily summaries
+
+        ``domain`` can narrow the summaries further, e.g. on
+        ``config_id.operating_unit_id``.
+        """
+        summary_domain = [('date', '>=', date_from), ('date', '<=', date_to)]
+        if config_ids:
+            summary_domain.append(('config_id', 'in', config_ids))
+        if domain:
+            summary_domain += domain
+
+        aggregates = ['%s:sum' % key for key in SUMMARY_TOTALS]
+        days = self._read_group(summary_domain, ['date:day'], aggregates, order='date:day asc')
+        result = {key: 0.0 for key in SUMMARY_TOTALS}
+        result.update(date_from=date_from, date_to=date_to, days=[], taxes=[], payments_amount=[])
+        for date, *totals in days:
+            day = dict(zip(SUMMARY_TOTALS, totals), date=date)
+            for key in SUMMARY_TOTALS:
+                result[key] += day[key]
+            result['days'].append(day)
+        result['net_gross_total'] = result['gross_profit_total'] - result['taxes_total']
+
+        line_domain = [('summary_id', 'any', summary_domain)]
+        for tax, net_total, tax_total in self.env['pos.sales.daily.summary.tax']._read_group(
+                line_domain, ['tax_id'], ['net_total:sum', 'tax_total:sum']):
+            result['taxes'].append({
+                'tax_id': tax.id,
+                'tax_name': tax.name,
+                'tax_per': tax.amount,
+                'net_total': net_total,
+                'tax_total': tax_total,
+                'gross_tax': net_total + tax_total,
+            })
+        for payment_method, amount in self.env['pos.sales.daily.summary.payment']._read_group(
+                line_domain, ['payment_method_id'], ['amount:sum']):
+            result['payments_amount'].append({
+                'payment_method_id': payment_method.id,
+                'name': payment_method.name,
+                'amount': amount,
+            })
+        return result
+
+
+class PosSalesDailySummaryTax(models.Model):
+    _name = 'pos.sales.daily.summary.tax'
+    _description = 'POS Daily Sales Summary Tax'
+
+    summary_id = fields.Many2one('pos.sales.daily.summary', required=True, index=True, ondelete='cascade')
+    currency_id = fields.Many2one(related='summary_id.currency_id')
+    tax_id = fields.Many2one('account.tax', string='Tax', required=True)
+    net_total = fields.Monetary('Net')
+    tax_total = fields.Monetary('Tax')
+
+
+class PosSalesDailySummaryPayment(models.Model):
+    _name = 'pos.sales.daily.summary.payment'
+    _description = 'POS Daily Sales Summary Payment'
+
+    summary_id = fields.Many2one('pos.sales.daily.summary', required=True, index=True, ondelete='cascade')
+    currency_id = fields.Many2one(related='summary_id.currency_id')
+    payment_method_id = fields.Many2one('pos.payment.method', string='Payment Method', required=True)
+    amount = fields.Monetary()
@@ -1,12 +1,26 @@
+import json
+import logging
 from pytz import timezone, UTC
 from datetime import datetime, date
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from odoo.tools import json_default
+
+_logger = logging.getLogger(__name__)
+
+Z_REPORT_DATA_NAME = 'z_report_data.json'
 
 
 class PosSession(models.Model):
     _inherit = "pos.session"
 
+    z_report_state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Rendered'),
+        ('failed', 'Failed'),
+    ], string='Z-Report Cache', copy=False, index=True, readonly=True,
+        help='Closed sessions get their Z report rendered once in the background and served from cache afterwards.')
+
     def get_current_date(self):
         if self.env.user and self.env.user.tz:
             tz = self.env.user.tz
@@ -32,102 +46,29 @@ class PosSession(models.Model):
             return datetime.now().strftime('%I:%M:%S %p')
 
     def get_cash_in_out(self):
-        account_bank_statement_lines = self.env['account.bank.statement.line'].search([
-            ('pos_session_id', '=', self.id)])
-        cash_in_out = {}
-        for absl in account_bank_statement_lines:
-            if absl.amount > 0:
-                cash_in_out.setdefault('cash_in', []).append({
-                    'amount': absl.amount,
-                    'date': absl.create_date
-                })
-            else:
-                cash_in_out.setdefault('cash_out', []).append({
-                    'amount': absl.amount,
-                    'date': absl.create_date
-                })
-        return cash_in_out
+        figures = self._get_z_report_figures()[self.id]
+        return {key: figures[key] for key in ('cash_in', 'cash_out') if figures[key]}
 
     def get_payments_amount(self):
-        payments_amount = []
-        for payment_method in self.config_id.payment_method_ids:
-            payments = self.env['pos.payment'].search([
-                ('session_id', '=', self.id),
-                ('payment_method_id', '=', payment_method.id)
-            ])
-            journal_dict = {
-                'name': payment_method.name,
-                'amount': 0
-            }
-            for payment in payments:
-                amount = payment.amount
-                journal_dict['amount'] += amount
-            payments_amount.append(journal_dict)
-        return payments_amount
+        return self._get_z_report_figures()[self.id]['payments_amount']
 
     def get_total_sales(self):
-        total_price = 0.0
-        for order in self.order_ids:
-            if order.amount_paid >= 0:
-                total_price += sum([(line.qty * line.price_unit) for line in order.lines])
-        return total_price
+        return self._get_z_report_figures()[self.id]['sales_total']
 
     def get_total_reversal(self):
-        total_price = 0.0
-        for order in self.order_ids:
-            if order.amount_paid <= 0:
-                total_price += order.amount_paid
-        return total_price
+        return self._get_z_report_figures()[self.id]['reversal_total']
 
     def get_reversal_orders_detail(self):
-        reversal_orders_detail = {}
-        for order in self.order_ids:
-            if order.amount_paid <= 0:
-                reversal_orders_detail[order.name] = []
-                for line in order.lines:
-                    reversal_orders_detail[order.name].append({
-                        'product_id': line.product_id.display_name,
-                        'qty': line.qty,
-                        'price_subtotal_incl': line.price_subtotal_incl,
-                    })
-        return reversal_orders_detail
+        return self._get_z_report_figures()[self.id]['reversal_orders_detail']
 
     def get_vat_tax(self):
-        taxes_info = []
-        tax_list = [tax.id for order in self.order_ids for line in
-                    order.lines.filtered(lambda line: line.tax_ids_after_fiscal_position) for tax in
-                    line.tax_ids_after_fiscal_position]
-        tax_list = list(set(tax_list))
-        for tax in self.env['account.tax'].browse(tax_list):
-            total_tax = 0.00
-            net_total = 0.00
-            for line in self.env['pos.order.line'].search(
-                    [('order_id', 'in', [order.id for order in self.order_ids])]).filtered(
-                lambda line: tax in line.tax_ids_after_fiscal_position):
-                total_tax += line.price_subtotal * tax.amount / 100
-                net_total += line.price_subtotal
-            taxes_info.append({
-                'tax_name': tax.name,
-                'tax_total': total_tax,
-                'tax_per': tax.amount,
-                'net_total': net_total,
-                'gross_tax': total_tax + net_total
-            })
-        return taxes_info
+        return self._get_z_report_figures()[self.id]['taxes']
 
     def get_total_tax(self):
-        total_tax = 0.0
-        for order in self.order_ids:
-            total_tax += order.amount_tax
-        return total_tax
+        return self._get_z_report_figures()[self.id]['taxes_total']
 
     def get_total_discount(self):
-        total_discount = 0.0
-        if self.order_ids:
-            for order in self.order_ids:
-                total_discount += sum([((line.qty * line.price_unit) * line.discount) / 100 for line in order.lines])
-                total_discount += sum([line.price_extra for line in order.lines])
-        return total_discount
+        return self._get_z_report_figures()[self.id]['discounts_total']
 
     # def get_sale_summary_by_user(self):
     #     user_summary = {}
@@ -146,26 +87,244 @@ class PosSession(models.Model):
     #     return user_summary
 
     def get_total_refund(self):
-        refund_total = 0.0
-        if self.order_ids:
-            for order in self.order_ids:
-                if order.amount_total < 0:
-                    refund_total += order.amount_total
-        return refund_total
+        return self._get_z_report_figures()[self.id]['refund_total']
 
     def get_total_first(self):
-        return sum(order.amount_total for order in self.order_ids)
+        return self._get_z_report_figures()[self.id]['gross_total']
 
     def get_gross_total(self):
-        gross_total = 0.0
-        if self.order_ids:
-            for order in self.order_ids:
-                for line in order.lines:
-                    gross_total += line.qty * (line.price_unit - line.product_id.standard_price)
-        return gross_total
+        return self._get_z_report_figures()[self.id]['gross_profit_total']
+
+    # ------------------------------------------------------------------
+    # Z-report engine: every figure of the sessions in ``self`` comes from
+    # a handful of grouped queries instead of per-order/per-line loops.
+    # ------------------------------------------------------------------
+
+    def _get_z_report_figures(self):
+        """Return the Z-report figures of every session in ``self``, keyed by session id"""
+        figures = {session.id: {
+            'orders_count': 0,
+            'sales_total': 0.0,
+            'reversal_total': 0.0,
+            'reversal_orders_detail': {},
+            'taxes': [],
+            'taxes_total': 0.0,
+            'discounts_total': 0.0,
+            'refund_total': 0.0,
+            'gross_total': 0.0,
+            'gross_profit_total': 0.0,
+            'payments_amount': [],
+            'cash_in': [],
+            'cash_out': [],
+        } for session in self}
+        if not self:
+            return figures
+        self.env.flush_all()
+        self._z_report_order_totals(figures)
+        self._z_report_line_totals(figures)
+        self._z_report_taxes(figures)
+        self._z_report_reversal_details(figures)
+        self._z_report_payments(figures)
+        self._z_report_cash_in_out(figures)
+        return figures
+
+    def _z_report_order_totals(self, figures):
+        self.env.cr.execute("""
+            SELECT session_id,
+                   COUNT(*) AS orders_count,
+                   COALESCE(SUM(amount_total), 0)::float AS gross_total,
+                   COALESCE(SUM(amount_tax), 0)::float AS taxes_total,
+                   COALESCE(SUM(amount_total) FILTER (WHERE amount_total < 0), 0)::float AS refund_total,
+                   COALESCE(SUM(amount_paid) FILTER (WHERE amount_paid <= 0), 0)::float AS reversal_total
+              FROM pos_order
+             WHERE session_id IN %s
+          GROUP BY session_id
+        """, [tuple(self.ids)])
+        for row in self.env.cr.dictfetchall():
+            figures[row.pop('session_id')].update(row)
+
+    def _z_report_line_totals(self, figures):
+        # Grouped by product too, as the cost used for the gross profit is
+        # a company-dependent field that is not readable from SQL.
+        self.env.cr.execute("""
+            SELECT o.session_id,
+                   l.product_id,
+                   COALESCE(SUM(l.qty), 0)::float AS qty,
+                   COALESCE(SUM(l.qty * l.price_unit), 0)::float AS amount,
+                   COALESCE(SUM(l.qty * l.price_unit) FILTER (WHERE o.amount_paid >= 0), 0)::float AS sales,
+                   COALESCE(SUM(l.qty * l.price_unit * l.discount / 100
+                                + COALESCE(l.price_extra, 0)), 0)::float AS discount
+              FROM pos_order_line l
+              JOIN pos_order o ON o.id = l.order_id
+             WHERE o.session_id IN %s
+          GROUP BY o.session_id, l.product_id
+        """, [tuple(self.ids)])
+        rows = self.env.cr.dictfetchall()
+        products = self.env['product.product'].browse({row['product_id'] for row in rows})
+        cost = {product.id: product.standard_price for product in products}
+        for row in rows:
+            session_figures = figures[row['session_id']]
+            session_figures['sales_total'] += row['sales']
+            session_figures['discounts_total'] += row['discount']
+            session_figures['gross_profit_total'] += row['amount'] - row['qty'] * cost[row['product_id']]
+
+    def _z_report_taxes(self, figures):
+        # Lines sharing a session, fiscal position, tax set and quantity sign
+        # are summed and go through a single ``compute_all``: percent taxes
+        # are linear in the amount and fixed taxes in the quantity, so the
+        # result matches the per-line computation for every tax type.
+        tax_field = self.env['pos.order.line']._fields['tax_ids']
+        self.env.cr.execute("""
+            WITH line_taxes AS (
+                SELECT rel.{line_col} AS line_id,
+                       ARRAY_AGG(rel.{tax_col} ORDER BY rel.{tax_col}) AS tax_ids
+                  FROM {relation} rel
+                  JOIN pos_order_line l ON l.id = rel.{line_col}
+                  JOIN pos_order o ON o.id = l.order_id
+                 WHERE o.session_id IN %s
+              GROUP BY rel.{line_col}
+            )
+            SELECT o.session_id,
+                   o.fiscal_position_id,
+                   lt.tax_ids,
+                   SUM(l.qty)::float AS qty,
+                   SUM(l.qty * l.price_unit * (1 - COALESCE(l.discount, 0) / 100))::float AS amount
+              FROM pos_order_line l
+              JOIN pos_order o ON o.id = l.order_id
+              JOIN line_taxes lt ON lt.line_id = l.id
+             WHERE o.session_id IN %s
+               AND l.qty != 0
+          GROUP BY o.session_id, o.fiscal_position_id, lt.tax_ids, l.qty > 0
+        """.format(
+            relation=tax_field.relation, line_col=tax_field.column1, tax_col=tax_field.column2,
+        ), [tuple(self.ids), tuple(self.ids)])
+        rows = self.env.cr.dictfetchall()
+        Tax = self.env['account.tax']
+        FiscalPosition = self.env['account.fiscal.position']
+        sessions = {session.id: session for session in self}
+        totals_by_tax = {}
+        for row in rows:
+            # Same taxes as ``tax_ids_after_fiscal_position``
+            taxes = FiscalPosition.browse(row['fiscal_position_id']).map_tax(Tax.browse(row['tax_ids']))
+            tax_results = taxes.compute_all(
+                row['amount'] / row['qty'],
+                currency=sessions[row['session_id']].currency_id,
+                quantity=row['qty'],
+            )
+            for tax_result in tax_results['taxes']:
+                key = (row['session_id'], tax_result['id'])
+                net_total, tax_total = totals_by_tax.get(key, (0.0, 0.0))
+                totals_by_tax[key] = (net_total + tax_result['base'], tax_total + tax_result['amount'])
+        for (session_id, tax_id), (net_total, total_tax) in totals_by_tax.items():
+            tax = Tax.browse(tax_id)
+            figures[session_id]['taxes'].append({
+                'tax_id': tax.id,
+                'tax_name': tax.name,
+                'tax_total': total_tax,
+                'tax_per': tax.amount,
+                'net_total': net_total,
+                'gross_tax': total_tax + net_total
+            })
+
+    def _z_report_reversal_details(self, figures):
+        self.env.cr.execute("""
+            SELECT o.session_id, o.name, l.product_id, l.qty::float, l.price_subtotal_incl::float
+              FROM pos_order o
+              JOIN pos_order_line l ON l.order_id = o.id
+             WHERE o.session_id IN %s
+               AND o.amount_paid <= 0
+          ORDER BY o.id, l.id
+        """, [tuple(self.ids)])
+        rows = self.env.cr.fetchall()
+        products = self.env['product.product'].browse({row[2] for row in rows})
+        names = {product.id: product.display_name for product in products}
+        for session_id, order_name, product_id, qty, price_subtotal_incl in rows:
+            figures[session_id]['reversal_orders_detail'].setdefault(order_name, []).append({
+                'product_id': names[product_id],
+                'qty': qty,
+                'price_subtotal_incl': price_subtotal_incl,
+            })
+
+    def _z_report_payments(self, figures):
+        self.env.cr.execute("""
+            SELECT session_id, payment_method_id, COALESCE(SUM(amount), 0)::float
+              FROM pos_payment
+             WHERE session_id IN %s
+          GROUP BY session_id, payment_method_id
+        """, [tuple(self.ids)])
+        amounts = {(session_id, method_id): amount for session_id, method_id, amount in self.env.cr.fetchall()}
+        for session in self:
+            figures[session.id]['payments_amount'] = [{
+                'payment_method_id': payment_method.id,
+                'name': payment_method.name,
+                'amount': amounts.get((session.id, payment_method.id), 0),
+            } for payment_method in session.config_id.payment_method_ids]
+
+    def _z_report_cash_in_out(self, figures):
+        statement_lines = self.env['account.bank.statement.line'].search_read(
+            [('pos_session_id', 'in', self.ids)], ['pos_session_id', 'amount', 'create_date'], order='id')
+        for absl in statement_lines:
+            key = 'cash_in' if absl['amount'] > 0 else 'cash_out'
+            figures[absl['pos_session_id'][0]][key].append({
+                'amount': absl['amount'],
+                'date': absl['create_date'],
+            })
+
+    def _validate_session(self, *args, **kwargs):
+        res = super()._validate_session(*args, **kwargs)
+        closed_sessions = self.filtered(lambda s: s.state == 'closed')
+        self.env['pos.sales.daily.summary'].sudo()._add_sessions(closed_sessions)
+        if closed_sessions:
+            closed_sessions.write({'z_report_state': 'pending'})
+            self.env.ref('adevx_pos_z_report.ir_cron_render_z_reports')._trigger()
+        return res
+
+    @api.model
+    def _cron_render_z_reports(self, batch_size=20):
+        sessions = self.search([('z_report_state', '=', 'pending'), ('state', '=', 'closed')], limit=batch_size)
+        for session in sessions:
+            try:
+                with self.env.cr.savepoint():
+                    session._render_z_report()
+            except Exception:
+                # Leave the failing session out of the queue, otherwise it blocks every following run
+                _logger.exception('Rendering the Z report of POS session %s failed', session.id)
+                session.z_report_state = 'failed'
+        self.env['ir.cron']._notify_progress(
+            done=len(sessions),
+            remaining=self.search_count([('z_report_state', '=', 'pending'), ('state', '=', 'closed')]),
+        )
+
+    def _render_z_report(self):
+        """Store the Z-report data and PDF of a closed session as attachments"""
+        self.ensure_one()
+        Attachment = self.env['ir.attachment'].sudo()
+        Attachment.search([
+            ('res_model', '=', self._name), ('res_id', '=', self.id), ('name', '=', Z_REPORT_DATA_NAME),
+        ]).unlink()
+        data = self.with_context(z_report_no_cache=True).build_sessions_report()[self.id]
+        Attachment.create({
+            'name': Z_REPORT_DATA_NAME,
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'application/json',
+            'raw': json.dumps(data, default=json_default).encode(),
+        })
+        self.z_report_state = 'done'
+        # Saved as attachment by the report itself (attachment_use)
+        self.env['ir.actions.report']._render_qweb_pdf('adevx_pos_z_report.action_report_z_report', self.ids)
+
+    def _get_z_report_cache(self):
+        """Return the stored Z-report data of the closed sessions in ``self``, keyed by session id"""
+        sessions = self.filtered(lambda s: s.state == 'closed' and s.z_report_state == 'done')
+        if not sessions or self.env.context.get('z_report_no_cache'):
+            return {}
+        attachments = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name), ('res_id', 'in', sessions.ids), ('name', '=', Z_REPORT_DATA_NAME),
+        ])
+        return {attachment.res_id: json.loads(attachment.raw) for attachment in attachments}
 
     def build_sessions_report(self):
-        print("++++++++++")
         vals = {}
         session_state = {
             'new_session': _('New Session'),
@@ -174,7 +333,16 @@ class PosSession(models.Model):
             'closing_control': _('Closing Control'),
             'closed': _('Closed & Posted'),
         }
+        cache = self._get_z_report_cache()
+        figures = (self - self.browse(list(cache)))._get_z_report_figures()
         for session in self:
+            if session.id in cache:
+                session_report = cache[session.id]
+                session_report['current_date'] = session.get_current_date()
+                session_report['current_time'] = session.get_current_time()
+                vals[session.id] = session_report
+                continue
+            session_figures = figures[session.id]
             session_report = {}
             session_report['name'] = session.name
             session_report['current_date'] = session.get_current_date()
@@ -184,22 +352,21 @@ class PosSession(models.Model):
             session_report['stop_at'] = session.stop_at
             session_report['seller'] = session.user_id.name
             session_report['cash_register_balance_start'] = session.cash_register_balance_start
-            session_report['orders_count'] = len(session.order_ids)
-            session_report['sales_total'] = session.get_total_sales()
-            session_report['reversal_total'] = session.get_total_reversal()
-            session_report['reversal_orders_detail'] = session.get_reversal_orders_detail()
-            session_report['taxes'] = session.get_vat_tax()
-            session_report['taxes_total'] = session.get_total_tax()
-            session_report['discounts_total'] = session.get_total_discount()
+            session_report['orders_count'] = session_figures['orders_count']
+            session_report['sales_total'] = session_figures['sales_total']
+            session_report['reversal_total'] = session_figures['reversal_total']
+            session_report['reversal_orders_detail'] = session_figures['reversal_orders_detail']
+            session_report['taxes'] = session_figures['taxes']
+            session_report['taxes_total'] = session_figures['taxes_total']
+            session_report['discounts_total'] = session_figures['discounts_total']
             # session_report['users_summary'] = session.get_sale_summary_by_user()
-            session_report['refund_total'] = session.get_total_refund()
-            session_report['gross_total'] = session.get_total_first()
-            session_report['gross_profit_total'] = session.get_gross_total()
-            session_report['net_gross_total'] = session.get_gross_total() - session.get_total_tax()
+            session_report['refund_total'] = session_figures['refund_total']
+            session_report['gross_total'] = session_figures['gross_total']
+            session_report['gross_profit_total'] = session_figures['gross_profit_total']
+            session_report['net_gross_total'] = session_figures['gross_profit_total'] - session_figures['taxes_total']
             session_report['closing_total'] = session.cash_register_balance_end_real
-            session_report['payments_amount'] = session.get_payments_amount()
-            session_report['cash_in'] = session.get_cash_in_out().get('cash_in', {})
-            session_report['cash_out'] = session.get_cash_in_out().get('cash_out', {})
+            session_report['payments_amount'] = session_figures['payments_amount']
+            session_report['cash_in'] = session_figures['cash_in'] or {}
+            session_report['cash_out'] = session_figures['cash_out'] or {}
             vals[session.id] = session_report
-        print("vals",vals)
         return vals
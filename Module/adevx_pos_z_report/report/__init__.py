@@ -0,0 +1,2 @@
+
+from . import z_report
@@ -0,0 +1,16 @@
+from odoo import api, models
+
+
+class ReportZReport(models.AbstractModel):
+    _name = 'report.adevx_pos_z_report.report_z_report'
+    _description = 'POS Z Report'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        sessions = self.env['pos.session'].browse(docids)
+        return {
+            'doc_ids': docids,
+            'doc_model': 'pos.session',
+            'docs': sessions,
+            'reports': sessions.build_sessions_report(),
+        }
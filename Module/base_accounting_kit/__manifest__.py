@@ -21,7 +21,7 @@
 #############################################################################
 {
     'name': 'Odoo 18 Full Accounting Kit for Community',
-    'version': '18.0.5.0.8',
+    'version': '18.0.5.0.9',
     'category': 'Accounting',
     'live_test_url': 'https://kit.easyinstance.com/web/login?redirect=/odoo/accounting',
     'summary': """Odoo 18 Accounting, Odoo 18 Accounting Reports, Odoo18 Accounting, Odoo Accounting, Odoo18 Financial Reports, Odoo18 Asset, Odoo18 Profit and Loss, PDC, Followups, Odoo18, Accounting, Odoo Apps, Reports""",
@@ -44,6 +44,7 @@
         'data/multiple_invoice_data.xml',
         'data/recurring_entry_cron.xml',
         'data/account_pdc_data.xml',
+        'data/ledger_export_cron.xml',
         'views/reports_config_view.xml',
         'views/accounting_menu.xml',
         'views/account_group.xml',
@@ -63,6 +64,7 @@
         'views/multiple_invoice_layout_view.xml',
         'views/multiple_invoice_form.xml',
         'views/account_journal_views.xml',
+        'views/account_ledger_export_views.xml',
         'wizard/financial_report_views.xml',
         'wizard/account_report_general_ledger_views.xml',
         'wizard/account_report_partner_ledger_views.xml',
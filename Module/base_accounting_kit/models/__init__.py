@@ -26,6 +26,7 @@ from . import account_asset_depreciation_line
 from . import account_bank_statement_line
 from . import account_followup
 from . import account_journal
+from . import account_ledger_export
 from . import account_move
 from . import account_move_line
 from . import account_payment
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import csv
+import io
+from contextlib import closing, contextmanager
+import json
+import logging
+import tempfile
+import psycopg2.extras
+import xlsxwriter
+from odoo import api, fields, models, _
+from odoo.tools.json import json_default
+
+_logger = logging.getLogger(__name__)
+
+# Number of rows fetched at once from the server-side cursor
+EXPORT_FETCH_SIZE = 2000
+# Rows of an XLSX worksheet, header included
+XLSX_MAX_ROWS = 1048576
+
+
+class AccountLedgerExport(models.Model):
+    """Background export of the general ledger and the partner ledger.
+    The move lines are read through a server-side cursor and written row
+    by row to a temporary CSV or XLSX file, so the ledger rows are never
+    held in memory; only the finished file is read once to be stored as
+    an attachment."""
+    _name = 'account.ledger.export'
+    _description = 'Ledger Export'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', required=True, readonly=True)
+    report_type = fields.Selection(
+        selection=[('general_ledger', 'General Ledger'),
+                   ('partner_ledger', 'Partner Ledger')],
+        string='Report', required=True, readonly=True)
+    file_format = fields.Selection(
+        selection=[('xlsx', 'XLSX'), ('csv', 'CSV')],
+        string='Format', required=True, readonly=True, default='xlsx')
+    state = fields.Selection(
+        selection=[('queued', 'Queued'), ('done', 'Done'),
+                   ('failed', 'Failed')],
+        string='Status', required=True, readonly=True, default='queued')
+    options = fields.Json(string='Options', readonly=True,
+                          help='Report options chosen in the wizard.')
+    user_id = fields.Many2one('res.users', string='Requested By',
+                              required=True, readonly=True,
+                              default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, readonly=True,
+                                 default=lambda self: self.env.company)
+    line_count = fields.Integer(string='Exported Lines', readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string='File',
+                                    readonly=True, ondelete='set null')
+    error = fields.Text(string='Error', readonly=True)
+
+    @api.model
+    def _queue_export(self, report_type, file_format, data):
+        """Queue the export of a ledger and wake up the export cron. Return
+        the notification action telling the user the file is on its way."""
+        export = self.create({
+            'name': '%s - %s' % (
+                dict(self._fields['report_type'].selection)[report_type],
+                fields.Datetime.to_string(fields.Datetime.now())),
+            'report_type': report_type,
+            'file_format': file_format,
+            'options': json.loads(json.dumps(data, default=json_default)),
+        })
+        self.env.ref(
+            'base_accounting_kit.ir_cron_ledger_export')._trigger()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _('The %s export is being generated, you will be '
+                             'notified when it is ready.', export.name),
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    @api.model
+    def _cron_process_exports(self):
+        """Generate the queued exports, one at a time."""
+        exports = self.search([('state', '=', 'queued')], order='id')
+        for done, export in enumerate(exports):
+            try:
+                with self.env.cr.savepoint():
+                    export._generate()
+            except Exception as error:
+                _logger.exception('Ledger export %s failed', export.id)
+                export.write({'state': 'failed', 'error': str(error)})
+            export._notify_user()
+            self.env['ir.cron']._notify_progress(
+                done=done + 1, remaining=len(exports) - done - 1)
+
+    def _generate(self):
+        """Stream the ledger rows into the export file and attach it"""
+        self.ensure_one()
+        env = self.with_user(self.user_id).with_company(self.company_id).env
+        export = self.with_env(env)
+        data = dict(self.options)
+        if self.report_type == 'general_ledger':
+            header, rows = export._get_general_ledger_rows(data)
+        else:
+            header, rows = export._get_partner_ledger_rows(data)
+        # Closing the rows closes their server-side cursor, including when
+        # writing the file fails half-way
+        with tempfile.TemporaryFile() as stream, closing(rows):
+            if self.file_format == 'csv':
+                line_count = self._write_csv(stream, header, rows)
+                mimetype = 'text/csv'
+            else:
+                line_count = self._write_xlsx(stream, header, rows)
+                mimetype = ('application/vnd.openxmlformats-officedocument.'
+                            'spreadsheetml.sheet')
+            stream.seek(0)
+            attachment = self.env['ir.attachment'].create({
+                'name': '%s.%s' % (self.name, self.file_format),
+                'raw': stream.read(),
+                'mimetype': mimetype,
+                'res_model': self._name,
+                'res_id': self.id,
+            })
+        self.write({
+            'state': 'done',
+            'attachment_id': attachment.id,
+            'line_count': line_count,
+            'error': False,
+        })
+
+    def _write_csv(self, stream, header, rows):
+        """Write the rows to the binary stream as CSV"""
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(header)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        text.flush()
+        text.detach()
+        return count
+
+    def _write_xlsx(self, stream, header, rows):
+        """Write the rows to the binary stream as XLSX, in constant memory
+        mode so each row is flushed to disk once written. A new worksheet,
+        with the header repeated, is started whenever one is full."""
+        workbook = xlsxwriter.Workbook(stream, {'constant_memory': True})
+        bold = workbook.add_format({'bold': True})
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+        sheet = None
+        sheet_row = XLSX_MAX_ROWS
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            if sheet_row >= XLSX_MAX_ROWS:
+                # xlsxwriter ignores the rows beyond the worksheet limit
+                # without raising, so the next sheet is opened beforehand
+                sheet = workbook.add_worksheet()
+                sheet.write_row(0, 0, header, bold)
+                sheet_row = 1
+            for column, value in enumerate(row):
+                if hasattr(value, 'isoformat'):
+                    sheet.write_datetime(sheet_row, column, value,
+                                         date_format)
+                else:
+                    sheet.write(sheet_row, column, value)
+            sheet_row += 1
+        if sheet is None:
+            workbook.add_worksheet().write_row(0, 0, header, bold)
+        workbook.close()
+        return count
+
+    @contextmanager
+    def _server_side_cursor(self):
+        """Open a read-only server-side (named) cursor, closed on exit.
+
+        Odoo's cursor wrapper has no named cursors, so the psycopg2 one is
+        opened on the connection of the current cursor. This is safe as
+        long as it is only used to read: a named cursor runs in the
+        transaction of its connection, so it sees the flushed data, and
+        it is closed when leaving the block, before any savepoint of the
+        wrapper is released or rolled back.
+        """
+        self.env.flush_all()
+        cursor = self.env.cr._cnx.cursor(
+            'ledger_export_%s' % self.id,
+            cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.itersize = EXPORT_FETCH_SIZE
+            yield cursor
+        finally:
+            cursor.close()
+
+    def _iter_query(self, query, params):
+        """Yield the rows of the query as dictionaries, fetched in batches
+        through a server-side cursor."""
+        with self._server_side_cursor() as cursor:
+            cursor.execute(query, params)
+            yield from cursor
+
+    def _get_general_ledger_rows(self, data):
+        """Return the header and the row generator of the general ledger"""
+        form = data['form']
+        report = self.env['report.base_accounting_kit.report_general_ledger']
+        report = report.with_context(form.get('used_context', {}))
+        if data.get('model') == 'account.account':
+            accounts = self.env['account.account'].browse(data.get('ids', []))
+        else:
+            accounts = self.env['account.account'].search([])
+        header = [_('Account Code'), _('Account'), _('Date'), _('Journal'),
+                  _('Entry'), _('Partner'), _('Label'), _('Reference'),
+                  _('Debit'), _('Credit'), _('Balance'), _('Currency'),
+                  _('Amount Currency')]
+        return header, self._iter_general_ledger_rows(
+            report, accounts, form.get('initial_balance', True),
+            form.get('sortby', 'sort_date'),
+            form.get('display_account', 'movement'))
+
+    def _iter_general_ledger_rows(self, report, accounts, init_balance,
+                                  sortby, display_account):
+        """Yield the general ledger rows account after account, starting
+        each account with its initial balance. The accounts are filtered on
+        display_account as in the PDF report."""
+        accounts = accounts.sorted(
+            lambda account: (account.code or '', account.id))
+        initial = {}
+        if accounts and init_balance:
+            sql, params = report._get_initial_balance_query(accounts)
+            self.env.cr.execute(sql, params)
+            initial = {row['account_id']: row
+                       for row in self.env.cr.dictfetchall()}
+        if accounts and display_account == 'not_zero':
+            balances = report._get_period_balances(accounts)
+            accounts = accounts.filtered(
+                lambda account: not (
+                    account.currency_id or self.env.company.currency_id
+                ).is_zero(balances.get(account.id, 0.0) + initial.get(
+                    account.id, {}).get('balance', 0.0)))
+        if not accounts:
+            return
+        pending = iter(accounts)
+        current = None
+        sql, params = report._get_move_lines_query(
+            accounts, sortby, initial_balances={
+                account_id: row['balance']
+                for account_id, row in initial.items()},
+            group_by_account=True)
+        with closing(self._iter_query(sql, params)) as lines:
+            for line in lines:
+                if not current or line['account_id'] != current.id:
+                    # Accounts without lines in the period only have their
+                    # initial balance, yield it before moving on
+                    for account in pending:
+                        if account.id == line['account_id']:
+                            if account.id in initial:
+                                yield self._get_initial_balance_row(
+                                    account, initial[account.id])
+                            current = account
+                            break
+                        yield from self._get_account_opening_rows(
+                            account, initial, display_account)
+                yield [current.code, current.name, line['ldate'],
+                       line['lcode'], line['move_name'],
+                       line['partner_name'] or '', line['lname'] or '',
+                       line['lref'] or '', line['debit'], line['credit'],
+                       line['balance'], line['currency_code'] or '',
+                       line['amount_currency'] or 0.0]
+        for account in pending:
+            yield from self._get_account_opening_rows(
+                account, initial, display_account)
+
+    def _get_account_opening_rows(self, account, initial, display_account):
+        """Return the rows of an account without lines in the period: its
+        initial balance, or an empty balance when all accounts are shown."""
+        if account.id in initial:
+            return [self._get_initial_balance_row(
+                account, initial[account.id])]
+        if display_account == 'all':
+            return [self._get_initial_balance_row(
+                account, {'debit': 0.0, 'credit': 0.0, 'balance': 0.0})]
+        return []
+
+    def _get_initial_balance_row(self, account, initial):
+        """Return the export row of the initial balance of an account"""
+        return [account.code, account.name, '', '', '', '',
+                _('Initial Balance'), '', initial['debit'],
+                initial['credit'], initial['balance'], '', 0.0]
+
+    def _get_partner_ledger_rows(self, data):
+        """Return the header and the row generator of the partner ledger"""
+        report = self.env['report.base_accounting_kit.report_partnerledger']
+        header = [_('Partner Reference'), _('Partner'), _('Date'),
+                  _('Journal'), _('Account'), _('Entry'), _('Debit'),
+                  _('Credit'), _('Balance'), _('Currency'),
+                  _('Amount Currency')]
+        return header, self._iter_partner_ledger_rows(report, data)
+
+    def _iter_partner_ledger_rows(self, report, data):
+        """Yield the partner ledger rows, partner after partner, with the
+        running balance of each partner."""
+        partner_ids = report._get_partner_ids(data)
+        if not partner_ids:
+            return
+        query, params = report._get_lines_query(data, partner_ids)
+        with closing(self._iter_query(query, params)) as lines:
+            for line in lines:
+                displayed_name = '-'.join(
+                    line[field_name]
+                    for field_name in ('move_name', 'ref', 'name')
+                    if line[field_name] not in (None, '', '/'))
+                yield [line['partner_ref'] or '', line['partner_name'] or '',
+                       line['date'], line['code'], line['a_name'],
+                       displayed_name, line['debit'], line['credit'],
+                       line['progress'], line['currency_code'] or '',
+                       line['amount_currency'] or 0.0]
+
+    def _notify_user(self):
+        """Notify the requesting user that the export is finished"""
+        self.ensure_one()
+        if self.state == 'done':
+            notification = {
+                'type': 'success',
+                'title': _('Ledger Export Ready'),
+                'message': _('%s is ready in Reporting > Audit Reports > '
+                             'Ledger Exports.', self.name),
+            }
+        else:
+            notification = {
+                'type': 'danger',
+                'title': _('Ledger Export Failed'),
+                'message': self.error or self.name,
+            }
+        self.user_id._bus_send('simple_notification', notification)
+
+    def action_download(self):
+        """Download the exported file"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.attachment_id.id,
+            'target': 'self',
+        }
@@ -20,7 +20,8 @@
 #
 #############################################################################
 import time
-from datetime import timedelta, datetime
+from itertools import groupby
+from operator import itemgetter
 from odoo import api, models, _
 from odoo.exceptions import UserError
 
@@ -29,13 +30,15 @@ class DayBookPdfReport(models.AbstractModel):
     _name = 'report.base_accounting_kit.day_book_report_template'
     _description = 'Day Book Report'
 
-    def _get_account_move_entry(self, accounts, form_data, pass_date):
+    def _get_account_move_entry(self, accounts, form_data, date_from,
+                                date_to):
+        """Return the day book of the period as a list of days, each with
+        its move lines and its debit, credit and balance totals.
+
+        The lines of the whole period are read by a single query, the daily
+        totals being computed by window functions partitioned by date.
+        """
         cr = self.env.cr
-        move_line = self.env['account.move.line']
-        tables, where_clause, where_params = move_line._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
         if form_data['target_move'] == 'posted':
             target_move = "AND m.state = 'posted'"
         else:
@@ -45,10 +48,13 @@ class DayBookPdfReport(models.AbstractModel):
                 account_id, l.date AS ldate, j.code AS lcode, l.currency_id, 
                 l.amount_currency, l.ref AS lref, l.name AS lname,
                  COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit, 
-                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS 
-                balance,
+                COALESCE(l.debit,0) - COALESCE(l.credit,0) AS balance,
                 m.name AS move_name, c.symbol AS currency_code, p.name 
-                AS partner_name
+                AS partner_name,
+                SUM(COALESCE(l.debit,0)) OVER day AS day_debit,
+                SUM(COALESCE(l.credit,0)) OVER day AS day_credit,
+                SUM(COALESCE(l.debit,0) - COALESCE(l.credit,0)) OVER day
+                AS day_balance
                 FROM account_move_line l
                 JOIN account_move m ON (l.move_id=m.id)
                 LEFT JOIN res_currency c ON (l.currency_id=c.id)
@@ -56,27 +62,25 @@ class DayBookPdfReport(models.AbstractModel):
                 JOIN account_journal j ON (l.journal_id=j.id)
                 JOIN account_account acc ON (l.account_id = acc.id) 
                 WHERE l.account_id IN %s AND l.journal_id IN %s '''
-               + target_move + ''' AND l.date = %s
-                GROUP BY l.id, l.account_id, l.date,
-                     j.code, l.currency_id, l.amount_currency, l.ref, 
-                     l.name, m.name, c.symbol, p.name , acc.name
-                     ORDER BY l.date DESC
+               + target_move + ''' AND l.date BETWEEN %s AND %s
+                WINDOW day AS (PARTITION BY l.date)
+                ORDER BY l.date, l.move_id, l.id
         ''')
-        params = (
-        tuple(accounts.ids), tuple(form_data['journal_ids']), pass_date)
+        params = (tuple(accounts.ids), tuple(form_data['journal_ids']),
+                  date_from, date_to)
         cr.execute(sql, params)
-        data = cr.dictfetchall()
-        res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
-        return res
+        record = []
+        for day, lines in groupby(cr.dictfetchall(),
+                                  key=itemgetter('ldate')):
+            lines = list(lines)
+            record.append({
+                'date': day,
+                'debit': lines[0]['day_debit'],
+                'credit': lines[0]['day_credit'],
+                'balance': lines[0]['day_balance'],
+                'child_lines': lines,
+            })
+        return record
 
     @api.model
     def _get_report_values(self, docids, data=None):
@@ -98,27 +102,9 @@ class DayBookPdfReport(models.AbstractModel):
             [('id', 'in', active_acc)]) if data['form']['account_ids'] else \
             self.env['account.account'].search([])
 
-        date_start = datetime.strptime(form_data['date_from'],
-                                       '%Y-%m-%d').date()
-        date_end = datetime.strptime(form_data['date_to'], '%Y-%m-%d').date()
-        days = date_end - date_start
-        dates = []
-        record = []
-        for i in range(days.days + 1):
-            dates.append(date_start + timedelta(days=i))
-        for head in dates:
-            pass_date = str(head)
-            accounts_res = self.with_context(
-                data['form'].get('used_context', {}))._get_account_move_entry(
-                accounts, form_data, pass_date)
-            if accounts_res['lines']:
-                record.append({
-                    'date': head,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'child_lines': accounts_res['lines']
-                })
+        record = self.with_context(
+            data['form'].get('used_context', {}))._get_account_move_entry(
+            accounts, form_data, form_data['date_from'], form_data['date_to'])
         return {
             'doc_ids': docids,
             'doc_model': model,
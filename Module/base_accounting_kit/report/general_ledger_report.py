@@ -28,6 +28,104 @@ class ReportGeneralLedger(models.AbstractModel):
     _name = 'report.base_accounting_kit.report_general_ledger'
     _description = 'General Ledger Report'
 
+    def _get_query_filters(self, **context):
+        """Return the where clause and the parameters of the move lines
+        selected by the report options, with the tables aliased as in the
+        report queries."""
+        tables, where_clause, where_params = self.env[
+            'account.move.line'].with_context(**context)._query_get()
+        wheres = [""]
+        if where_clause.strip():
+            wheres.append(where_clause.strip())
+        filters = " AND ".join(wheres)
+        filters = filters.replace('account_move_line__move_id', 'm').replace(
+            'account_move_line', 'l')
+        return filters, where_params
+
+    def _get_initial_balance_query(self, accounts):
+        """Return the query and the parameters giving one 'Initial Balance'
+        line per account, summing the move lines before the start date."""
+        filters, where_params = self._get_query_filters(
+            date_from=self.env.context.get('date_from'), date_to=False,
+            initial_bal=True)
+        sql = ("""SELECT 0 AS lid, l.account_id AS account_id, '' 
+        AS ldate, '' AS lcode, 0.0 AS amount_currency, '' AS lref, 
+        'Initial Balance' AS lname, COALESCE(SUM(l.debit),0.0) AS debit,
+         COALESCE(SUM(l.credit),0.0) AS credit, COALESCE(SUM(l.debit),0) 
+         - COALESCE(SUM(l.credit), 0) as balance, '' AS lpartner_id,\
+            '' AS move_name, '' AS mmove_id, '' AS currency_code,\
+            NULL AS currency_id,\
+            '' AS invoice_id, '' AS invoice_type, '' AS invoice_number,\
+            '' AS partner_name\
+            FROM account_move_line l\
+            LEFT JOIN account_move m ON (l.move_id=m.id)\
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)\
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)\
+            LEFT JOIN account_move i ON (m.id =i.id)\
+            JOIN account_journal j ON (l.journal_id=j.id)\
+            WHERE l.account_id IN %s""" + filters +
+               ' GROUP BY l.account_id')
+        params = (tuple(accounts.ids),) + tuple(where_params)
+        return sql, params
+
+    def _get_period_balances(self, accounts):
+        """Return the balance of the move lines of the period per account id"""
+        filters, where_params = self._get_query_filters()
+        self.env.cr.execute("""SELECT l.account_id,
+            COALESCE(SUM(l.debit), 0) - COALESCE(SUM(l.credit), 0)
+            FROM account_move_line l
+            JOIN account_move m ON (l.move_id=m.id)
+            JOIN account_journal j ON (l.journal_id=j.id)
+            WHERE l.account_id IN %s """ + filters + """
+            GROUP BY l.account_id""",
+                            (tuple(accounts.ids),) + tuple(where_params))
+        return dict(self.env.cr.fetchall())
+
+    def _get_move_lines_query(self, accounts, sortby, initial_balances=None,
+                              group_by_account=False):
+        """Return the query and the parameters selecting the move lines of
+        the accounts in the report order.
+
+        The balance of each line is the running balance of its account,
+        computed by a window function over the lines in the report order
+        and starting from the initial balance given per account id in
+        initial_balances. With group_by_account, the lines are first
+        ordered as the given accounts so they can be streamed account after
+        account.
+        """
+        sql_sort = 'l.date, l.move_id, l.id'
+        if sortby == 'sort_journal_partner':
+            sql_sort = 'j.code, p.name, l.move_id, l.id'
+        initial_balances = initial_balances or {}
+        sql_order = sql_sort
+        sort_params = ()
+        if group_by_account:
+            sql_order = 'array_position(%s, l.account_id), ' + sql_sort
+            sort_params = (accounts.ids,)
+        filters, where_params = self._get_query_filters()
+        sql = ("""SELECT l.id AS lid, l.account_id AS account_id,
+            l.date AS ldate, j.code AS lcode, l.currency_id,
+            l.amount_currency, l.ref AS lref, l.name AS lname,
+            COALESCE(l.debit, 0) AS debit, COALESCE(l.credit, 0) AS credit,
+            COALESCE(ib.balance, 0) + SUM(
+                COALESCE(l.debit, 0) - COALESCE(l.credit, 0)) OVER (
+                PARTITION BY l.account_id ORDER BY """ + sql_sort + """
+                ROWS UNBOUNDED PRECEDING) AS balance,
+            m.name AS move_name, c.symbol AS currency_code,
+            p.name AS partner_name
+            FROM account_move_line l
+            JOIN account_move m ON (l.move_id=m.id)
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)
+            JOIN account_journal j ON (l.journal_id=j.id)
+            LEFT JOIN unnest(%s::int[], %s::numeric[])
+                AS ib(account_id, balance) ON (ib.account_id = l.account_id)
+            WHERE l.account_id IN %s """ + filters + """
+            ORDER BY """ + sql_order)
+        params = (list(initial_balances), list(initial_balances.values()),
+                  tuple(accounts.ids)) + tuple(where_params) + sort_params
+        return sql, params
+
     def _get_account_move_entry(self, accounts, init_balance, sortby,
                                 display_account):
         """
@@ -48,96 +146,46 @@ class ReportGeneralLedger(models.AbstractModel):
         }
         """
         cr = self.env.cr
-        MoveLine = self.env['account.move.line']
         move_lines = {x: [] for x in accounts.ids}
+        totals = {x: {'debit': 0.0, 'credit': 0.0, 'balance': 0.0}
+                  for x in accounts.ids}
 
         # Prepare initial sql query and Get the initial move lines
         if init_balance:
-            init_tables, init_where_clause, init_where_params = MoveLine.with_context(
-                date_from=self.env.context.get('date_from'), date_to=False,
-                initial_bal=True)._query_get()
-            init_wheres = [""]
-            if init_where_clause.strip():
-                init_wheres.append(init_where_clause.strip())
-            init_filters = " AND ".join(init_wheres)
-            filters = init_filters.replace('account_move_line__move_id',
-                                           'm').replace('account_move_line',
-                                                        'l')
-            sql = ("""SELECT 0 AS lid, l.account_id AS account_id, '' 
-            AS ldate, '' AS lcode, 0.0 AS amount_currency, '' AS lref, 
-            'Initial Balance' AS lname, COALESCE(SUM(l.debit),0.0) AS debit,
-             COALESCE(SUM(l.credit),0.0) AS credit, COALESCE(SUM(l.debit),0) 
-             - COALESCE(SUM(l.credit), 0) as balance, '' AS lpartner_id,\
-                '' AS move_name, '' AS mmove_id, '' AS currency_code,\
-                NULL AS currency_id,\
-                '' AS invoice_id, '' AS invoice_type, '' AS invoice_number,\
-                '' AS partner_name\
-                FROM account_move_line l\
-                LEFT JOIN account_move m ON (l.move_id=m.id)\
-                LEFT JOIN res_currency c ON (l.currency_id=c.id)\
-                LEFT JOIN res_partner p ON (l.partner_id=p.id)\
-                LEFT JOIN account_move i ON (m.id =i.id)\
-                JOIN account_journal j ON (l.journal_id=j.id)\
-                WHERE l.account_id IN %s""" + filters +
-                   ' GROUP BY l.account_id')
-            params = (tuple(accounts.ids),) + tuple(init_where_params)
+            sql, params = self._get_initial_balance_query(accounts)
             cr.execute(sql, params)
             for row in cr.dictfetchall():
-                move_lines[row.pop('account_id')].append(row)
-
-        sql_sort = 'l.date, l.move_id'
-        if sortby == 'sort_journal_partner':
-            sql_sort = 'j.code, p.name, l.move_id'
-
-        # Prepare sql query base on selected parameters from wizard
-        tables, where_clause, where_params = MoveLine._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
-        filters = " AND ".join(wheres)
-        filters = filters.replace('account_move_line__move_id', 'm').replace(
-            'account_move_line', 'l')
+                account_id = row.pop('account_id')
+                totals[account_id].update(
+                    debit=row['debit'], credit=row['credit'],
+                    balance=row['balance'])
+                move_lines[account_id].append(row)
 
-        # Get move lines base on sql query and Calculate the total balance of move lines
-        sql = ('''SELECT l.id AS lid, l.account_id AS account_id, 
-        l.date AS ldate, j.code AS lcode, l.currency_id, l.amount_currency, 
-        l.ref AS lref, l.name AS lname, COALESCE(l.debit,0) AS debit, 
-        COALESCE(l.credit,0) AS credit, COALESCE(SUM(l.debit),0) - 
-        COALESCE(SUM(l.credit), 0) AS balance,\
-            m.name AS move_name, c.symbol AS currency_code, p.name AS 
-            partner_name\
-            FROM account_move_line l\
-            JOIN account_move m ON (l.move_id=m.id)\
-            LEFT JOIN res_currency c ON (l.currency_id=c.id)\
-            LEFT JOIN res_partner p ON (l.partner_id=p.id)\
-            JOIN account_journal j ON (l.journal_id=j.id)\
-            JOIN account_account acc ON (l.account_id = acc.id) \
-            WHERE l.account_id IN %s ''' + filters + ''' GROUP BY l.id, 
-            l.account_id, l.date, j.code, l.currency_id, l.amount_currency, 
-            l.ref, l.name, m.name, c.symbol, p.name ORDER BY ''' + sql_sort)
-        params = (tuple(accounts.ids),) + tuple(where_params)
+        # Get the move lines with their running balance, starting from the
+        # initial balance of their account
+        initial_balances = {account_id: total['balance']
+                            for account_id, total in totals.items()
+                            if move_lines[account_id]}
+        sql, params = self._get_move_lines_query(accounts, sortby,
+                                                 initial_balances)
         cr.execute(sql, params)
-
         for row in cr.dictfetchall():
-            balance = 0
-            for line in move_lines.get(row['account_id']):
-                balance += line['debit'] - line['credit']
-            row['balance'] += balance
-            move_lines[row.pop('account_id')].append(row)
+            account_id = row.pop('account_id')
+            total = totals[account_id]
+            total['debit'] += row['debit']
+            total['credit'] += row['credit']
+            total['balance'] = row['balance']
+            move_lines[account_id].append(row)
 
         # Calculate the debit, credit and balance for Accounts
         account_res = []
         for account in accounts:
             account_company = self.env.company
             currency = account.currency_id and account.currency_id or account_company.currency_id
-            res = dict((fn, 0.0) for fn in ['credit', 'debit', 'balance'])
+            res = dict(totals[account.id])
             res['code'] = account.code
             res['name'] = account.name
             res['move_lines'] = move_lines[account.id]
-            for line in res.get('move_lines'):
-                res['debit'] += line['debit']
-                res['credit'] += line['credit']
-                res['balance'] = line['balance']
             if display_account == 'all':
                 account_res.append(res)
             if display_account == 'movement' and res.get('move_lines'):
@@ -33,6 +33,12 @@ class ReportAgedPartnerBalance(models.AbstractModel):
 
     def _get_partner_move_lines(self, account_type, date_from, target_move,
                                 period_length):
+        """Return the aged balance of the partners, the column totals and the
+        number of aged lines per partner.
+
+        The aging buckets, the partial reconciliations and the currency
+        conversion are all computed by a single SQL statement.
+        """
         # This method can receive the context key 'include_nullified_amount' {Boolean}
         # Do an invoice and a payment and unreconcile. The amount will be nullified
         # By default, the partner wouldn't appear in this report.
@@ -62,202 +68,167 @@ class ReportAgedPartnerBalance(models.AbstractModel):
             start = stop
 
         res = []
-        total = []
-        cr = self.env.cr
+        total = [0] * 7
         user_company = self.env.company
         user_currency = user_company.currency_id
-        ResCurrency = self.env['res.currency'].with_context(date=date_from)
         company_ids = self._context.get('company_ids') or [user_company.id]
         move_state = ['draft', 'posted']
         if target_move == 'posted':
             move_state = ['posted']
-        arg_list = (tuple(move_state), tuple(account_type))
-        # build the reconciliation clause to see what partner needs to be printed
-        reconciliation_clause = '(l.reconciled IS FALSE)'
-        cr.execute(
-            'SELECT debit_move_id, credit_move_id FROM account_partial_reconcile where max_date > %s',
-            (date_from,))
-        reconciled_after_date = []
-
-        for row in cr.fetchall():
-            reconciled_after_date += [row[0], row[1]]
-
-        if reconciled_after_date:
-            reconciliation_clause = '(l.reconciled IS FALSE OR l.id IN %s)'
-            arg_list += (tuple(reconciled_after_date),)
-        arg_list += (date_from, tuple(company_ids))
-        query = '''
-            SELECT DISTINCT l.partner_id, UPPER(res_partner.name)
-            FROM account_move_line AS l left join res_partner on l.partner_id = res_partner.id, account_account, account_move am
-            WHERE (l.account_id = account_account.id)
-                AND (l.move_id = am.id)
-                AND (am.state IN %s)
-                AND (account_account.account_type IN %s)
-                AND ''' + reconciliation_clause + '''
-                AND (l.date <= %s)
-                AND l.company_id IN %s
-            ORDER BY UPPER(res_partner.name)'''
-        cr.execute(query, arg_list)
-
-        partners = cr.dictfetchall()
-        # put a total of 0
-        for i in range(7):
-            total.append(0)
-
-        # Build a string like (1,2,3) for easy use in SQL query
-        partner_ids = [partner['partner_id'] for partner in partners if
-                       partner['partner_id']]
-        lines = dict(
-            (partner['partner_id'] or False, []) for partner in partners)
-        if not partner_ids:
-            return [], [], {}
-
-        # This dictionary will store the not due amount of all partners
-        undue_amounts = {}
-        query = '''SELECT l.id
-                FROM account_move_line AS l, account_account, account_move am
-                WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                    AND (am.state IN %s)
-                    AND (account_account.account_type IN %s)
-                    AND (COALESCE(l.date_maturity,l.date) >= %s)\
-                    AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                AND (l.date <= %s)
-                AND l.company_id IN %s'''
-        cr.execute(query, (
-            tuple(move_state), tuple(account_type), date_from,
-            tuple(partner_ids), date_from, tuple(company_ids)))
-        aml_ids = cr.fetchall()
-        aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-        for line in self.env['account.move.line'].browse(aml_ids):
-            partner_id = line.partner_id.id or False
-            if partner_id not in undue_amounts:
-                undue_amounts[partner_id] = 0.0
-            line_amount = ResCurrency._get_conversion_rate(line.company_id.currency_id,
-                                               user_currency, line.balance)
-            if user_currency.is_zero(line_amount):
-                continue
-            for partial_line in line.matched_debit_ids:
-                if partial_line.max_date <= date_from:
-                    line_amount += ResCurrency._get_conversion_rate(
-                        partial_line.company_id.currency_id, user_currency,
-                        partial_line.amount)
-            for partial_line in line.matched_credit_ids:
-                if partial_line.max_date <= date_from:
-                    line_amount -= ResCurrency._get_conversion_rate(
-                        partial_line.company_id.currency_id, user_currency,
-                        partial_line.amount)
-            if not self.env.company.currency_id.is_zero(line_amount):
-                undue_amounts[partner_id] += line_amount
-                lines[partner_id].append({
-                    'line': line,
-                    'amount': line_amount,
-                    'period': 6,
-                })
-        # Use one query per period and store results in history (a list variable)
-        # Each history will contain: history[1] = {'<partner_id>': <partner_debit-credit>}
-        history = []
+        # Rates from the currency of each company to the user currency, so
+        # the lines and the partials are converted inside the query.
+        rates = {}
+        for company in self.env['res.company'].browse(company_ids):
+            rates[company.currency_id.id] = self.env[
+                'res.currency']._get_conversion_rate(
+                company.currency_id, user_currency, user_company, date_from)
+        params = {
+            'move_state': tuple(move_state),
+            'account_type': tuple(account_type),
+            'date_from': date_from,
+            'company_ids': tuple(company_ids),
+            'currency_ids': list(rates),
+            'rates': list(rates.values()),
+            'rounding': user_currency.rounding,
+        }
+        bucket_columns = []
         for i in range(5):
-            args_list = (
-            tuple(move_state), tuple(account_type), tuple(partner_ids),)
-            dates_query = '(COALESCE(l.date_maturity,l.date)'
-
-            if periods[str(i)]['start'] and periods[str(i)]['stop']:
-                dates_query += ' BETWEEN %s AND %s)'
-                args_list += (
-                periods[str(i)]['start'], periods[str(i)]['stop'])
-            elif periods[str(i)]['start']:
-                dates_query += ' >= %s)'
-                args_list += (periods[str(i)]['start'],)
+            period = periods[str(i)]
+            if period['start'] and period['stop']:
+                condition = (
+                    'am.due_date BETWEEN %%(start_%s)s AND %%(stop_%s)s' % (
+                        i, i))
+            elif period['start']:
+                condition = 'am.due_date >= %%(start_%s)s' % i
             else:
-                dates_query += ' <= %s)'
-                args_list += (periods[str(i)]['stop'],)
-            args_list += (date_from, tuple(company_ids))
-            query = '''SELECT l.id
-                    FROM account_move_line AS l, account_account, account_move am
-                    WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                        AND (am.state IN %s)
-                        AND (account_account.account_type IN %s)
-                        AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                        AND ''' + dates_query + '''
-                    AND (l.date <= %s)
-                    AND l.company_id IN %s'''
-            cr.execute(query, args_list)
-            partners_amount = {}
-            aml_ids = cr.fetchall()
-            aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-            for line in self.env['account.move.line'].browse(aml_ids):
-                partner_id = line.partner_id.id or False
-                if partner_id not in partners_amount:
-                    partners_amount[partner_id] = 0.0
-                line_amount = ResCurrency._get_conversion_rate(line.company_id.currency_id,
-                                                   user_currency, line.balance)
-                if user_currency.is_zero(line_amount):
-                    continue
-                for partial_line in line.matched_debit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_amount += ResCurrency._get_conversion_rate(
-                            partial_line.company_id.currency_id, user_currency,
-                            partial_line.amount)
-                for partial_line in line.matched_credit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_amount -= ResCurrency._get_conversion_rate(
-                            partial_line.company_id.currency_id, user_currency,
-                            partial_line.amount)
-
-                if not self.env.company.currency_id.is_zero(
-                        line_amount):
-                    partners_amount[partner_id] += line_amount
-                    lines[partner_id].append({
-                        'line': line,
-                        'amount': line_amount,
-                        'period': i + 1,
-                    })
-            history.append(partners_amount)
-        for partner in partners:
-            if partner['partner_id'] is None:
-                partner['partner_id'] = False
-            at_least_one_amount = False
-            values = {}
-            undue_amt = 0.0
-            if partner[
-                'partner_id'] in undue_amounts:  # Making sure this partner actually was found by the query
-                undue_amt = undue_amounts[partner['partner_id']]
-
-            total[6] = total[6] + undue_amt
-            values['direction'] = undue_amt
-            if not float_is_zero(values['direction'],
-                                 precision_rounding=self.env.company.currency_id.rounding):
-                at_least_one_amount = True
-
+                condition = 'am.due_date <= %%(stop_%s)s' % i
+            params['start_%s' % i] = period['start']
+            params['stop_%s' % i] = period['stop']
+            bucket_columns.append(
+                'COALESCE(SUM(am.amount) FILTER (WHERE %s), 0.0)::float'
+                ' AS "%s"' % (condition, i))
+        # One statement: the partners to print (open lines or lines
+        # reconciled after the date), their lines net of the partials
+        # reconciled before the date, and the amounts bucketed by due date.
+        # The amounts are aggregated per partner before being joined to the
+        # partners on a plain equality, the lines without partner using 0.
+        query = """
+            WITH rates AS (
+                SELECT *
+                  FROM unnest(%(currency_ids)s::int[], %(rates)s::numeric[])
+                       AS r(currency_id, rate)
+            ),
+            aged_lines AS (
+                SELECT l.id, l.partner_id, l.reconciled,
+                       COALESCE(l.date_maturity, l.date) AS due_date,
+                       l.balance * COALESCE(r.rate, 1) AS line_amount
+                  FROM account_move_line l
+                  JOIN account_move am ON am.id = l.move_id
+                  JOIN account_account a ON a.id = l.account_id
+                  JOIN res_company c ON c.id = l.company_id
+                  LEFT JOIN rates r ON r.currency_id = c.currency_id
+                 WHERE am.state IN %(move_state)s
+                   AND a.account_type IN %(account_type)s
+                   AND l.date <= %(date_from)s
+                   AND l.company_id IN %(company_ids)s
+            ),
+            partials AS (
+                SELECT p.credit_move_id AS line_id, p.max_date,
+                       p.amount * COALESCE(r.rate, 1) AS amount
+                  FROM account_partial_reconcile p
+                  JOIN res_company c ON c.id = p.company_id
+                  LEFT JOIN rates r ON r.currency_id = c.currency_id
+                UNION ALL
+                SELECT p.debit_move_id, p.max_date,
+                       -p.amount * COALESCE(r.rate, 1)
+                  FROM account_partial_reconcile p
+                  JOIN res_company c ON c.id = p.company_id
+                  LEFT JOIN rates r ON r.currency_id = c.currency_id
+            ),
+            partners AS (
+                SELECT DISTINCT al.partner_id
+                  FROM aged_lines al
+                 WHERE NOT al.reconciled
+                    OR al.id IN (SELECT line_id
+                                   FROM partials
+                                  WHERE max_date > %(date_from)s)
+            ),
+            partial_amounts AS (
+                SELECT line_id AS id, SUM(amount) AS amount
+                  FROM partials
+                 WHERE max_date <= %(date_from)s
+                 GROUP BY line_id
+            ),
+            amounts AS (
+                SELECT al.partner_id, al.due_date,
+                       al.line_amount + COALESCE(pa.amount, 0.0) AS amount
+                  FROM aged_lines al
+                  LEFT JOIN partial_amounts pa ON pa.id = al.id
+                 WHERE (al.partner_id IN (SELECT partner_id FROM partners)
+                        OR al.partner_id IS NULL)
+                   AND ROUND(al.line_amount / %(rounding)s) != 0
+            ),
+            partner_amounts AS (
+                SELECT COALESCE(am.partner_id, 0) AS partner_key,
+                       COUNT(*) AS line_count,
+                       COALESCE(SUM(am.amount) FILTER (
+                           WHERE am.due_date >= %(date_from)s), 0.0)::float
+                           AS direction,
+                       """ + ',\n                       '.join(
+            bucket_columns) + """
+                  FROM amounts am
+                 WHERE ROUND(am.amount / %(rounding)s) != 0
+                 GROUP BY COALESCE(am.partner_id, 0)
+            )
+            SELECT pt.partner_id,
+                   COALESCE(pa.line_count, 0) AS line_count,
+                   COALESCE(pa.direction, 0.0) AS direction,
+                   """ + ',\n                   '.join(
+            'COALESCE(pa."%s", 0.0) AS "%s"' % (i, i) for i in range(5)) + """
+              FROM partners pt
+              LEFT JOIN res_partner rp ON rp.id = pt.partner_id
+              LEFT JOIN partner_amounts pa
+                ON pa.partner_key = COALESCE(pt.partner_id, 0)
+             ORDER BY UPPER(rp.name)
+        """
+        self.env.cr.execute(query, params)
+        rows = self.env.cr.dictfetchall()
+        if not any(row['partner_id'] for row in rows):
+            return [], [], {}
+        partners = self.env['res.partner'].browse(
+            [row['partner_id'] for row in rows if row['partner_id']])
+        partners.fetch(['name', 'trust'])
+        lines = {}
+        rounding = user_currency.rounding
+        for row in rows:
+            partner_id = row['partner_id'] or False
+            lines[partner_id] = row['line_count']
+            values = {'direction': row['direction']}
+            total[6] += values['direction']
+            at_least_one_amount = not float_is_zero(
+                values['direction'], precision_rounding=rounding)
             for i in range(5):
-                during = False
-                if partner['partner_id'] in history[i]:
-                    during = [history[i][partner['partner_id']]]
-                # Adding counter
-                total[(i)] = total[(i)] + (during and during[0] or 0)
-                values[str(i)] = during and during[0] or 0.0
+                values[str(i)] = row[str(i)]
+                total[i] += values[str(i)]
                 if not float_is_zero(values[str(i)],
-                                     precision_rounding=self.env.company.currency_id.rounding):
+                                     precision_rounding=rounding):
                     at_least_one_amount = True
             values['total'] = sum(
                 [values['direction']] + [values[str(i)] for i in range(5)])
-            ## Add for total
-            total[(i + 1)] += values['total']
-            values['partner_id'] = partner['partner_id']
-            if partner['partner_id']:
-                browsed_partner = self.env['res.partner'].browse(
-                    partner['partner_id'])
-                values['name'] = browsed_partner.name and len(
-                    browsed_partner.name) >= 45 and browsed_partner.name[
-                                                    0:40] + '...' or browsed_partner.name
-                values['trust'] = browsed_partner.trust
+            total[5] += values['total']
+            values['partner_id'] = partner_id
+            if partner_id:
+                partner = self.env['res.partner'].browse(partner_id)
+                values['name'] = partner.name and len(
+                    partner.name) >= 45 and partner.name[
+                                            0:40] + '...' or partner.name
+                values['trust'] = partner.trust
             else:
                 values['name'] = _('Unknown Partner')
                 values['trust'] = False
-
             if at_least_one_amount or (
                     self._context.get('include_nullified_amount') and lines[
-                partner['partner_id']]):
+                partner_id]):
                 res.append(values)
         return res, total, lines
 
@@ -28,14 +28,19 @@ class ReportPartnerLedger(models.AbstractModel):
     _name = 'report.base_accounting_kit.report_partnerledger'
     _description = 'Partner Ledger Report'
 
-    def _lines(self, data, partner):
-        full_account = []
-        currency = self.env['res.currency']
+    def _get_lines_query(self, data, partner_ids):
+        """Return the query and the parameters selecting the ledger lines of
+        the partners, ordered partner after partner as in the report.
+
+        Window functions partitioned by partner give the running balance of
+        each line (progress) and the debit, credit and balance totals of its
+        partner, so the ledger of all the partners is read in one query.
+        """
         query_get_data = self.env['account.move.line'].with_context(
             data['form'].get('used_context', {}))._query_get()
         reconcile_clause = "" if data['form'][
             'reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [partner.id, tuple(data['computed']['move_state']),
+        params = [tuple(partner_ids), tuple(data['computed']['move_state']),
                   tuple(data['computed']['account_ids'])] + \
                  query_get_data[2]
         query = """
@@ -44,35 +49,63 @@ class ReportPartnerLedger(models.AbstractModel):
              m.name as move_name, "account_move_line".name, 
              "account_move_line".debit, "account_move_line".credit, 
              "account_move_line".amount_currency,
-             "account_move_line".currency_id, c.symbol AS currency_code
+             "account_move_line".currency_id, c.symbol AS currency_code,
+             "account_move_line".partner_id, p.ref AS partner_ref,
+             p.name AS partner_name,
+             SUM("account_move_line".debit - "account_move_line".credit)
+              OVER (PARTITION BY "account_move_line".partner_id
+                    ORDER BY "account_move_line".date, "account_move_line".id
+                    ROWS UNBOUNDED PRECEDING) AS progress,
+             SUM("account_move_line".debit) OVER partner AS partner_debit,
+             SUM("account_move_line".credit) OVER partner AS partner_credit,
+             SUM("account_move_line".debit - "account_move_line".credit)
+              OVER partner AS partner_balance
             FROM """ + query_get_data[0] + """
             LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
             LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
             LEFT JOIN res_currency c ON ("account_move_line".currency_id=c.id)
             LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
-            WHERE "account_move_line".partner_id = %s
+            LEFT JOIN res_partner p ON (p.id="account_move_line".partner_id)
+            WHERE "account_move_line".partner_id IN %s
                 AND m.state IN %s
                 AND "account_move_line".account_id IN %s AND """ + \
                 query_get_data[1] + reconcile_clause + """
-                ORDER BY "account_move_line".date"""
-        self.env.cr.execute(query, tuple(params))
-        res = self.env.cr.dictfetchall()
-        sum = 0.0
-        lang_code = self.env.context.get('lang') or 'en_US'
-        lang = self.env['res.lang']
-        lang_id = lang._lang_get(lang_code)
-        date_format = lang_id.date_format
-        for r in res:
-            r['date'] = r['date']
+                WINDOW partner AS (
+                 PARTITION BY "account_move_line".partner_id)
+                ORDER BY COALESCE(p.ref, ''), COALESCE(p.name, ''), p.id,
+                 "account_move_line".date, "account_move_line".id"""
+        return query, tuple(params)
+
+    def _get_partner_ledgers(self, data, partner_ids):
+        """Return the ledger of each partner, in the report order, as a
+        dictionary {partner_id: {'lines', 'debit', 'credit', 'balance'}}
+        built in a single pass over the lines of all the partners."""
+        ledgers = {}
+        if not partner_ids:
+            return ledgers
+        currency = self.env['res.currency']
+        query, params = self._get_lines_query(data, partner_ids)
+        self.env.cr.execute(query, params)
+        for r in self.env.cr.dictfetchall():
+            ledger = ledgers.get(r['partner_id'])
+            if ledger is None:
+                ledger = ledgers[r['partner_id']] = {
+                    'lines': [],
+                    'debit': r['partner_debit'],
+                    'credit': r['partner_credit'],
+                    'balance': r['partner_balance'],
+                }
             r['displayed_name'] = '-'.join(
                 r[field_name] for field_name in ('move_name', 'ref', 'name')
                 if r[field_name] not in (None, '', '/')
             )
-            sum += r['debit'] - r['credit']
-            r['progress'] = sum
             r['currency_id'] = currency.browse(r.get('currency_id'))
-            full_account.append(r)
-        return full_account
+            ledger['lines'].append(r)
+        return ledgers
+
+    def _lines(self, data, partner):
+        ledger = self._get_partner_ledgers(data, [partner.id]).get(partner.id)
+        return ledger['lines'] if ledger else []
 
     def _sum_partner(self, data, partner, field):
         if field not in ['debit', 'credit', 'debit - credit']:
@@ -100,15 +133,11 @@ class ReportPartnerLedger(models.AbstractModel):
             result = contemp[0] or 0.0
         return result
 
-    @api.model
-    def _get_report_values(self, docids, data=None):
-        if not data.get('form'):
-            raise UserError(
-                _("Form content is missing, this report cannot be printed."))
-
+    def _get_partner_ids(self, data):
+        """Compute the move states and the accounts of the report options in
+        data['computed'] and return the partners having ledger lines."""
         data['computed'] = {}
 
-        obj_partner = self.env['res.partner']
         query_get_data = self.env['account.move.line'].with_context(
             data['form'].get('used_context', {}))._query_get()
         data['computed']['move_state'] = ['draft', 'posted']
@@ -146,8 +175,17 @@ class ReportPartnerLedger(models.AbstractModel):
                 AND """ + query_get_data[1] + reconcile_clause
         self.env.cr.execute(query, tuple(params))
         partner_ids = [res['partner_id'] for res in self.env.cr.dictfetchall()]
-        partners = obj_partner.browse(partner_ids)
-        partners = sorted(partners, key=lambda x: (x.ref or '', x.name or ''))
+        return partner_ids
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        if not data.get('form'):
+            raise UserError(
+                _("Form content is missing, this report cannot be printed."))
+
+        partner_ids = self._get_partner_ids(data)
+        ledgers = self._get_partner_ledgers(data, partner_ids)
+        partners = self.env['res.partner'].browse(list(ledgers))
         return {
             'doc_ids': partner_ids,
             'doc_model': self.env['res.partner'],
@@ -156,4 +194,5 @@ class ReportPartnerLedger(models.AbstractModel):
             'time': time,
             'lines': self._lines,
             'sum_partner': self._sum_partner,
+            'ledgers': ledgers,
         }
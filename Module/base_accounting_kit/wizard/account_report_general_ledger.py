@@ -59,7 +59,19 @@ class AccountReportGeneralLedger(models.TransientModel):
         if data['form'].get('initial_balance') and not data['form'].get(
                 'date_from'):
             raise UserError(_("You must define a Start Date"))
+        if self.env.context.get('ledger_export_format'):
+            return self.env['account.ledger.export']._queue_export(
+                'general_ledger', self.env.context['ledger_export_format'],
+                data)
         records = self.env[data['model']].browse(data.get('ids', []))
         return self.env.ref(
             'base_accounting_kit.action_report_general_ledger').with_context(
             landscape=True).report_action(records, data=data)
+
+    def action_export_xlsx(self):
+        """Export the general ledger to XLSX in the background"""
+        return self.with_context(ledger_export_format='xlsx').check_report()
+
+    def action_export_csv(self):
+        """Export the general ledger to CSV in the background"""
+        return self.with_context(ledger_export_format='csv').check_report()
@@ -47,6 +47,18 @@ class AccountPartnerLedger(models.TransientModel):
         data = self.pre_print_report(data)
         data['form'].update({'reconciled': self.reconciled,
                              'amount_currency': self.amount_currency})
+        if self.env.context.get('ledger_export_format'):
+            return self.env['account.ledger.export']._queue_export(
+                'partner_ledger', self.env.context['ledger_export_format'],
+                data)
         return self.env.ref(
             'base_accounting_kit.action_report_partnerledger').report_action(
             self, data=data)
+
+    def action_export_xlsx(self):
+        """Export the partner ledger to XLSX in the background"""
+        return self.with_context(ledger_export_format='xlsx').check_report()
+
+    def action_export_csv(self):
+        """Export the partner ledger to CSV in the background"""
+        return self.with_context(ledger_export_format='csv').check_report()
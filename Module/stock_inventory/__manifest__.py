@@ -1,6 +1,6 @@
 {
     "name": "Stock Inventory Adjustment",
-    "version": "18.0.1.1.2",
+    "version": "18.0.1.3.0",
     "license": "LGPL-3",
     "maintainer": ["DavidJForgeFlow"],
     "development_status": "Beta",
@@ -12,6 +12,7 @@
     "data": [
         "security/ir.model.access.csv",
         "security/security.xml",
+        "data/ir_cron.xml",
         "views/stock_inventory.xml",
         "views/stock_quant.xml",
         "views/stock_move_line.xml",
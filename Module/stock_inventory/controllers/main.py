@@ -0,0 +1,21 @@
+# Copyright 2024 ForgeFlow S.L. (http://www.forgeflow.com)
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl.html).
+
+from odoo import http
+from odoo.http import request
+
+
+class StockInventoryController(http.Controller):
+    @http.route(
+        "/stock_inventory/<int:inventory_id>/counts", type="json", auth="user"
+    )
+    def record_counts(self, inventory_id, lines, mode="set"):
+        """Record a batch of scanned count lines on an in-progress inventory.
+
+        Each line is a dict with the product ``barcode``, the ``location``
+        barcode, an optional ``lot`` name and the counted ``quantity``.
+        """
+        inventory = request.env["stock.inventory"].browse(inventory_id).exists()
+        if not inventory:
+            raise request.not_found()
+        return inventory._apply_scanned_counts(lines, mode=mode)
@@ -1,5 +1,7 @@
 from . import stock_inventory
+from . import stock_inventory_claim
 from . import stock_quant
 from . import stock_move_line
+from . import stock_location
 from . import res_company
 from . import res_config_settings
@@ -13,3 +13,8 @@ class ResCompany(models.Model):
         "are done, the adjustment is automatically set to done.",
         default=False,
     )
+    stock_inventory_apply_batch_size = fields.Integer(
+        default=500,
+        help="Number of quants applied per transaction when an inventory "
+        "adjustment is applied in the background.",
+    )
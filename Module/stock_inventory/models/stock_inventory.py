@@ -1,7 +1,11 @@
+import logging
+
 from odoo import api, fields, models
 from odoo.exceptions import UserError, ValidationError
 from odoo.osv import expression
 
+_logger = logging.getLogger(__name__)
+
 
 class InventoryAdjustmentsGroup(models.Model):
     _name = "stock.inventory"
@@ -139,6 +143,36 @@ class InventoryAdjustmentsGroup(models.Model):
         relation="stock_inventory_product_review_rel",
     )
 
+    apply_state = fields.Selection(
+        [
+            ("queued", "Queued"),
+            ("done", "Applied"),
+            ("failed", "Failed"),
+        ],
+        string="Background Application",
+        readonly=True,
+        copy=False,
+    )
+    apply_user_id = fields.Many2one(
+        comodel_name="res.users",
+        string="Applied by",
+        readonly=True,
+        copy=False,
+        help="User on behalf of whom the counted quants are applied in the "
+        "background.",
+    )
+    apply_total = fields.Integer(readonly=True, copy=False)
+    apply_done = fields.Integer(readonly=True, copy=False)
+    apply_progress = fields.Float(compute="_compute_apply_progress")
+    apply_error = fields.Text(readonly=True, copy=False)
+
+    @api.depends("apply_total", "apply_done")
+    def _compute_apply_progress(self):
+        for rec in self:
+            rec.apply_progress = (
+                100.0 * rec.apply_done / rec.apply_total if rec.apply_total else 0.0
+            )
+
     def _search_products_under_review_ids(self, operator, value):
         quants = self.env["stock.quant"].search(
             [("to_do", "=", True), ("product_id", operator, value)]
@@ -146,35 +180,57 @@ class InventoryAdjustmentsGroup(models.Model):
         inventories = quants.mapped("stock_inventory_ids")
         return [("id", "in", inventories.ids), ("state", "=", "in_progress")]
 
+    def _get_quant_counters(self):
+        """Return ``{inventory_id: (quant count, pending count, product ids)}``
+        for the inventories in ``self``, computed with one grouped query on
+        the inventory/quant relation table."""
+        inventory_ids = self._origin.ids
+        if not inventory_ids:
+            return {}
+        self.flush_model(["stock_quant_ids"])
+        self.env["stock.quant"].flush_model(
+            ["to_do", "current_inventory_id", "product_id"]
+        )
+        self.env.cr.execute(
+            """
+            SELECT rel.stock_inventory_id,
+                   COUNT(*),
+                   COUNT(*) FILTER (
+                       WHERE q.to_do
+                         AND q.current_inventory_id = rel.stock_inventory_id
+                   ),
+                   ARRAY_AGG(DISTINCT q.product_id) FILTER (WHERE q.to_do)
+              FROM stock_inventory_stock_quant_rel rel
+              JOIN stock_quant q ON q.id = rel.stock_quant_id
+             WHERE rel.stock_inventory_id = ANY(%(inventory_ids)s)
+             GROUP BY rel.stock_inventory_id
+            """,
+            {"inventory_ids": inventory_ids},
+        )
+        return {
+            inventory_id: (count, pending_count, product_ids or [])
+            for inventory_id, count, pending_count, product_ids in (
+                self.env.cr.fetchall()
+            )
+        }
+
     @api.depends("stock_quant_ids", "stock_quant_ids.to_do", "state")
     def _compute_products_under_review_ids(self):
+        in_progress = self.filtered(lambda r: r.state == "in_progress")
+        counters = in_progress._get_quant_counters()
         for record in self:
-            if record.state == "in_progress":
-                products = record.stock_quant_ids.filtered(
-                    lambda quant: quant.to_do
-                ).mapped("product_id")
-                record.products_under_review_ids = (
-                    [(6, 0, products.ids)] if products else [(5, 0, 0)]
-                )
-            else:
-                record.products_under_review_ids = [(5, 0, 0)]
+            product_ids = counters.get(record._origin.id, (0, 0, []))[2]
+            record.products_under_review_ids = (
+                [(6, 0, product_ids)] if product_ids else [(5, 0, 0)]
+            )
 
     @api.depends("stock_quant_ids")
     def _compute_count_stock_quants(self):
+        counters = self._get_quant_counters()
         for rec in self:
-            current_inventory_id = rec.id
-            quants = rec.stock_quant_ids
-            quants_to_do = quants.filtered(lambda q: q.to_do)
-            quants_pending_to_review = [
-                q
-                for q in quants_to_do
-                if q.current_inventory_id.id == current_inventory_id
-            ]
-            count_pending_to_review = len(quants_pending_to_review)
-            rec.count_stock_quants = len(quants)
-            rec.count_stock_quants_string = (
-                f"{count_pending_to_review} / {rec.count_stock_quants}"
-            )
+            count, pending_count = counters.get(rec._origin.id, (0, 0, []))[:2]
+            rec.count_stock_quants = count
+            rec.count_stock_quants_string = f"{pending_count} / {count}"
 
     @api.depends("stock_move_ids")
     def _compute_count_stock_moves(self):
@@ -214,14 +270,8 @@ class InventoryAdjustmentsGroup(models.Model):
         return self.env["stock.quant"].search(domain)
 
     def _get_base_domain(self, locations):
-        return (
-            [
-                ("location_id", "in", locations.mapped("id")),
-            ]
-            if self.exclude_sublocation
-            else [
-                ("location_id", "child_of", locations.child_internal_location_ids.ids),
-            ]
+        return locations._get_scope_domain(
+            "location_id", include_children=not self.exclude_sublocation
         )
 
     def _get_domain_all_quants(self, base_domain):
@@ -278,17 +328,7 @@ class InventoryAdjustmentsGroup(models.Model):
 
     def action_state_to_in_progress(self):
         self.ensure_one()
-        search_filter = [
-            (
-                "location_id",
-                "child_of" if not self.exclude_sublocation else "in",
-                self.location_ids.ids,
-            ),
-            ("to_do", "=", True),
-        ]
-
         if self.product_ids:
-            search_filter.append(("product_id", "in", self.product_ids.ids))
             error_field = "product_id"
             error_message = self.env._(
                 "There are active adjustments for the requested products: %(names)s. "
@@ -302,17 +342,16 @@ class InventoryAdjustmentsGroup(models.Model):
                 "Blocking adjustments: %(blocking_names)s"
             )
 
-        quants = self.env["stock.quant"].search(search_filter)
-        if quants:
-            inventory_ids = self.env["stock.inventory"].search(
-                [("stock_quant_ids", "in", quants.ids), ("state", "=", "in_progress")]
+        inventory_ids, record_ids = self._get_claim_conflicts(error_field)
+        if inventory_ids:
+            blocking_names = ", ".join(self.browse(inventory_ids).mapped("name"))
+            comodel = self.env["stock.quant"]._fields[error_field].comodel_name
+            names = ", ".join(
+                self.env[comodel].browse(record_ids).mapped("display_name")
+            )
+            raise ValidationError(
+                error_message % {"names": names, "blocking_names": blocking_names}
             )
-            if inventory_ids:
-                blocking_names = ", ".join(inventory_ids.mapped("name"))
-                names = self._get_quant_joined_names(quants, error_field)
-                raise ValidationError(
-                    error_message % {"names": names, "blocking_names": blocking_names}
-                )
 
         quants = self._get_quants(self.location_ids)
         self.write(
@@ -321,19 +360,123 @@ class InventoryAdjustmentsGroup(models.Model):
                 "stock_quant_ids": [(6, 0, quants.ids)],
             }
         )
-        quants.write(
+        self._register_claims()
+        self._mark_quants_to_do(quants)
+        return
+
+    def _register_claims(self):
+        """Register the location/product scope of the inventories as claims"""
+        vals_list = []
+        for rec in self:
+            for location in rec.location_ids:
+                for product in rec.product_ids or [self.env["product.product"]]:
+                    vals_list.append(
+                        {
+                            "inventory_id": rec.id,
+                            "location_id": location.id,
+                            "include_children": not rec.exclude_sublocation,
+                            "product_id": product.id,
+                        }
+                    )
+        self.env["stock.inventory.claim"].sudo().create(vals_list)
+
+    def _release_claims(self):
+        self.env["stock.inventory.claim"].sudo().search(
+            [("inventory_id", "in", self.ids)]
+        ).unlink()
+
+    def _get_claim_conflicts(self, error_field):
+        """Find the in-progress inventories blocking this one.
+
+        A claim blocks the inventory when a to-do quant lies both in the
+        scope of the claim and in the scope of this inventory. Return the
+        blocking inventory ids and the ids of the ``error_field`` values
+        (product or location) of the conflicting quants.
+        """
+        self.ensure_one()
+        self.env["stock.quant"].flush_model(["to_do", "location_id", "product_id"])
+        self.env["stock.location"].flush_model(["parent_path"])
+        self.env["stock.inventory.claim"].flush_model()
+        if self.exclude_sublocation:
+            scope_condition = "l.id = ANY(%(location_ids)s)"
+        else:
+            scope_condition = "l.parent_path LIKE ANY(%(location_paths)s)"
+        product_condition = (
+            "q.product_id = ANY(%(product_ids)s)" if self.product_ids else "TRUE"
+        )
+        claim_subtree = self.env["stock.location"]._get_subtree_sql_condition("l", "cl")
+        # error_field is one of the two hardcoded quant columns above
+        self.env.cr.execute(
+            f"""
+            SELECT DISTINCT c.inventory_id, q.{error_field}
+              FROM stock_quant q
+              JOIN stock_location l ON l.id = q.location_id
+              JOIN stock_inventory_claim c
+                ON (c.product_id IS NULL OR c.product_id = q.product_id)
+              JOIN stock_location cl ON cl.id = c.location_id
+             WHERE q.to_do
+               AND c.inventory_id != %(inventory_id)s
+               AND (l.id = cl.id OR (c.include_children AND {claim_subtree}))
+               AND {scope_condition}
+               AND {product_condition}
+            """,
             {
-                "to_do": True,
-                "user_id": self.responsible_id,
-                "inventory_date": self.date,
-                "current_inventory_id": self.id,
-            }
+                "inventory_id": self.id,
+                "location_ids": self.location_ids.ids,
+                "location_paths": [
+                    f"{path}%" for path in self.location_ids.mapped("parent_path")
+                ],
+                "product_ids": self.product_ids.ids,
+            },
         )
-        return
+        rows = self.env.cr.fetchall()
+        inventory_ids = list(dict.fromkeys(row[0] for row in rows))
+        record_ids = list(dict.fromkeys(row[1] for row in rows))
+        return inventory_ids, record_ids
+
+    def _mark_quants_to_do(self, quants):
+        """Mark the quants as counted by this inventory with one UPDATE"""
+        self.ensure_one()
+        if not quants:
+            return
+        self.env["stock.quant"].flush_model(
+            ["to_do", "user_id", "inventory_date", "current_inventory_id"]
+        )
+        self.env.cr.execute(
+            """
+            UPDATE stock_quant
+               SET to_do = TRUE,
+                   user_id = %(user_id)s,
+                   inventory_date = %(inventory_date)s,
+                   current_inventory_id = %(inventory_id)s,
+                   write_uid = %(uid)s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+             WHERE id = ANY(%(quant_ids)s)
+            """,
+            {
+                "user_id": self.responsible_id.id or None,
+                "inventory_date": fields.Date.to_date(self.date),
+                "inventory_id": self.id,
+                "uid": self.env.uid,
+                "quant_ids": quants.ids,
+            },
+        )
+        quants.invalidate_recordset(
+            [
+                "to_do",
+                "user_id",
+                "inventory_date",
+                "current_inventory_id",
+                "write_uid",
+                "write_date",
+            ]
+        )
+        quants.modified(["to_do", "user_id", "inventory_date", "current_inventory_id"])
 
     def action_state_to_done(self):
         self.ensure_one()
         self.state = "done"
+        self._release_claims()
         self.stock_quant_ids.filtered(
             lambda q: q.current_inventory_id.id == self.id
         ).update(
@@ -346,6 +489,225 @@ class InventoryAdjustmentsGroup(models.Model):
         )
         return
 
+    def _get_apply_pending_domain(self):
+        """Counted quants of the inventories that are still to be applied"""
+        return [
+            ("current_inventory_id", "in", self.ids),
+            ("to_do", "=", True),
+            ("inventory_quantity_set", "=", True),
+        ]
+
+    def action_apply_inventory_in_batches(self):
+        """Apply the counted quants in the background, one batch per commit.
+
+        Quants are released as they get applied, so a failed or interrupted
+        application resumes with the remaining ones when scheduled again.
+        """
+        quant_model = self.env["stock.quant"]
+        for rec in self:
+            if rec.state != "in_progress":
+                raise UserError(
+                    self.env._(
+                        "Only in-progress inventories can be applied: "
+                        "%(display_name)s.",
+                        display_name=rec.display_name,
+                    )
+                )
+            rec.write(
+                {
+                    "apply_state": "queued",
+                    "apply_user_id": self.env.uid,
+                    "apply_total": quant_model.search_count(
+                        rec._get_apply_pending_domain()
+                    ),
+                    "apply_done": 0,
+                    "apply_error": False,
+                }
+            )
+        self.env.ref("stock_inventory.ir_cron_apply_inventory_batches")._trigger()
+
+    @api.model
+    def _cron_apply_inventory_batches(self):
+        inventory = self.search([("apply_state", "=", "queued")], order="id", limit=1)
+        done = inventory._apply_inventory_batch() if inventory else 0
+        queued = self.search([("apply_state", "=", "queued")])
+        self.env["ir.cron"]._notify_progress(
+            done=done,
+            remaining=self.env["stock.quant"].search_count(
+                queued._get_apply_pending_domain()
+            )
+            if queued
+            else 0,
+        )
+
+    def _apply_inventory_batch(self):
+        """Apply the next batch of counted quants, return how many were applied"""
+        self.ensure_one()
+        batch_size = self.company_id.stock_inventory_apply_batch_size or 500
+        quants = self.env["stock.quant"].search(
+            self._get_apply_pending_domain(), order="id", limit=batch_size
+        )
+        if not quants:
+            self.apply_state = "done"
+            return 0
+        # Go through the same checks as the interactive application: a
+        # returned action is a confirmation the batch cannot answer
+        try:
+            with self.env.cr.savepoint():
+                action = (
+                    quants.with_user(self.apply_user_id)
+                    .with_company(self.company_id)
+                    .action_apply_inventory()
+                )
+                if isinstance(action, dict):
+                    raise UserError(self._get_apply_check_error(action))
+        except UserError as e:
+            _logger.warning(
+                "Failed to apply inventory %s: %s", self.display_name, e
+            )
+            self.write({"apply_state": "failed", "apply_error": str(e)})
+            return 0
+        self.apply_done += len(quants)
+        if not self.env["stock.quant"].search_count(
+            self._get_apply_pending_domain(), limit=1
+        ):
+            self.apply_state = "done"
+        return len(quants)
+
+    def _get_apply_check_error(self, action):
+        """Return why a batch cannot be applied, from the confirmation action
+        returned by ``stock.quant.action_apply_inventory``."""
+        res_model = action.get("res_model")
+        if res_model == "stock.track.confirmation":
+            return self.env._(
+                "Some tracked products are counted without a lot. Set their "
+                "lots or apply them from the inventory."
+            )
+        if res_model == "stock.inventory.conflict":
+            return self.env._(
+                "Some quantities changed since they were counted. Review the "
+                "outdated counts before applying the inventory again."
+            )
+        return self.env._(
+            "Applying the counts requires a confirmation (%(name)s). Apply "
+            "them from the inventory instead.",
+            name=action.get("name") or res_model,
+        )
+
+    def _apply_scanned_counts(self, lines, mode="set"):
+        """Record a batch of scanned counts on the quants of this inventory.
+
+        ``lines`` is a list of dicts with the product ``barcode``, the
+        ``location`` barcode, an optional ``lot`` name and the counted
+        ``quantity``. With ``mode="add"`` the quantities are added to the
+        current counts instead of replacing them, so several scanners can
+        count the same quant. Products, locations, lots and quants are each
+        resolved with one query and the counts are written with a single
+        UPDATE. Return the number of quants counted and the lines that could
+        not be applied, with their index and the reason.
+        """
+        self.ensure_one()
+        self.check_access("write")
+        if self.state != "in_progress":
+            raise UserError(
+                self.env._(
+                    "Counts can only be recorded on in-progress inventories."
+                )
+            )
+        if mode not in ("set", "add"):
+            raise UserError(self.env._("Unknown count mode: %s", mode))
+        products = self.env["product.product"].search(
+            [("barcode", "in", list({line.get("barcode") for line in lines}))]
+        )
+        product_ids = {product.barcode: product.id for product in products}
+        locations = self.env["stock.location"].search(
+            [("barcode", "in", list({line.get("location") for line in lines}))]
+        )
+        location_ids = {location.barcode: location.id for location in locations}
+        lot_names = list({line["lot"] for line in lines if line.get("lot")})
+        lots = self.env["stock.lot"].search(
+            [("name", "in", lot_names), ("product_id", "in", products.ids)]
+        )
+        lot_ids = {(lot.product_id.id, lot.name): lot.id for lot in lots}
+        quants = self.env["stock.quant"].search(
+            [
+                ("product_id", "in", products.ids),
+                ("location_id", "in", locations.ids),
+                ("stock_inventory_ids", "in", self.ids),
+            ]
+        )
+        quants_by_key = {
+            (quant.product_id.id, quant.location_id.id, quant.lot_id.id): quant
+            for quant in quants
+        }
+        counts = {}
+        conflicts = []
+        for index, line in enumerate(lines):
+            product_id = product_ids.get(line.get("barcode"))
+            location_id = location_ids.get(line.get("location"))
+            lot_id = lot_ids.get((product_id, line.get("lot"))) or False
+            quant = quants_by_key.get((product_id, location_id, lot_id))
+            if not product_id:
+                reason = "unknown_product"
+            elif not location_id:
+                reason = "unknown_location"
+            elif line.get("lot") and not lot_id:
+                reason = "unknown_lot"
+            elif not quant:
+                reason = "not_in_inventory"
+            elif not quant.to_do or quant.current_inventory_id != self:
+                reason = "not_to_count"
+            else:
+                counts[quant.id] = counts.get(quant.id, 0.0) + line.get(
+                    "quantity", 0.0
+                )
+                continue
+            conflicts.append({"index": index, "reason": reason})
+        self._write_scanned_counts(counts, mode)
+        return {"counted": len(counts), "conflicts": conflicts}
+
+    def _write_scanned_counts(self, counts, mode):
+        """Write ``{quant_id: quantity}`` counts with one UPDATE statement"""
+        if not counts:
+            return
+        quants = self.env["stock.quant"].browse(sorted(counts))
+        fnames = ["inventory_quantity", "inventory_quantity_set", "user_id"]
+        quants.flush_recordset(fnames)
+        # Lock the rows in a stable order so that concurrent scanner batches
+        # touching the same quants wait on each other instead of deadlocking.
+        self.env.cr.execute(
+            """
+            SELECT id FROM stock_quant
+             WHERE id = ANY(%s)
+             ORDER BY id
+               FOR NO KEY UPDATE
+            """,
+            [quants.ids],
+        )
+        if mode == "add":
+            quantity = "COALESCE(q.inventory_quantity, 0) + c.quantity"
+        else:
+            quantity = "c.quantity"
+        self.env.cr.execute(
+            f"""
+            UPDATE stock_quant q
+               SET inventory_quantity = {quantity},
+                   inventory_quantity_set = TRUE,
+                   user_id = %(user_id)s,
+                   write_uid = %(user_id)s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM unnest(%(quant_ids)s, %(quantities)s) AS c(quant_id, quantity)
+             WHERE q.id = c.quant_id
+            """,
+            {
+                "user_id": self.env.uid,
+                "quant_ids": quants.ids,
+                "quantities": [float(counts[quant_id]) for quant_id in quants.ids],
+            },
+        )
+        quants.invalidate_recordset(fnames + ["write_uid", "write_date"])
+        quants.modified(fnames)
+
     def action_auto_state_to_done(self):
         self.ensure_one()
         if not any(self.stock_quant_ids.filtered(lambda sq: sq.to_do)):
@@ -355,6 +717,7 @@ class InventoryAdjustmentsGroup(models.Model):
     def action_state_to_draft(self):
         self.ensure_one()
         self.state = "draft"
+        self._release_claims()
         self.stock_quant_ids.filtered(
             lambda q: q.current_inventory_id.id == self.id
         ).update(
@@ -401,7 +764,7 @@ class InventoryAdjustmentsGroup(models.Model):
         result.update(
             {
                 "domain": [
-                    ("id", "in", self.stock_quant_ids.ids),
+                    ("stock_inventory_ids", "in", self.ids),
                     ("current_inventory_id", "=", self.id),
                 ],
                 "search_view_id": self.env.ref("stock.quant_search_view").id,
@@ -422,36 +785,23 @@ class InventoryAdjustmentsGroup(models.Model):
     def _check_inventory_in_progress_not_override(self):
         for rec in self:
             if rec.state == "in_progress":
-                location_condition = [
-                    (
-                        "location_ids",
-                        "child_of" if not rec.exclude_sublocation else "in",
-                        rec.location_ids.ids,
-                    )
+                # Inventories sharing a location (and a product, when
+                # restricted to products) with this one
+                domain = [
+                    ("state", "=", "in_progress"),
+                    ("id", "!=", rec.id),
+                    ("location_ids", "in", rec.location_ids.ids),
                 ]
                 if rec.product_ids:
-                    product_condition = [
-                        ("state", "=", "in_progress"),
-                        ("id", "!=", rec.id),
-                        ("product_ids", "in", rec.product_ids.ids),
-                    ] + location_condition
-                    inventories = self.search(product_condition)
-                else:
-                    inventories = self.search(
-                        [("state", "=", "in_progress"), ("id", "!=", rec.id)]
-                        + location_condition
-                    )
-                for inventory in inventories:
-                    if any(
-                        i in inventory.location_ids.ids for i in rec.location_ids.ids
-                    ):
-                        raise ValidationError(
-                            self.env._(
-                                "Cannot have more than one in-progress inventory "
-                                "adjustment affecting the same location or product "
-                                "at the same time."
-                            )
+                    domain.append(("product_ids", "in", rec.product_ids.ids))
+                if self.search_count(domain, limit=1):
+                    raise ValidationError(
+                        self.env._(
+                            "Cannot have more than one in-progress inventory "
+                            "adjustment affecting the same location or product "
+                            "at the same time."
                         )
+                    )
 
     @api.constrains("product_selection", "product_ids")
     def _check_one_product_in_product_selection(self):
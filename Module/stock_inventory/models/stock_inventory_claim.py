@@ -0,0 +1,31 @@
+# Copyright 2024 ForgeFlow S.L. (http://www.forgeflow.com)
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl.html).
+
+from odoo import fields, models
+
+
+class StockInventoryClaim(models.Model):
+    """Location and product scope locked by an in-progress inventory.
+
+    One claim is registered per location (and per product when the
+    inventory is restricted to products) when the inventory starts, and
+    removed when it leaves the in-progress state. Conflicts between
+    inventories are detected from this table with a single query.
+    """
+
+    _name = "stock.inventory.claim"
+    _description = "Inventory Adjustment Location Claim"
+
+    inventory_id = fields.Many2one(
+        "stock.inventory", required=True, index=True, ondelete="cascade"
+    )
+    location_id = fields.Many2one(
+        "stock.location", required=True, index=True, ondelete="cascade"
+    )
+    include_children = fields.Boolean()
+    product_id = fields.Many2one(
+        "product.product",
+        index="btree_not_null",
+        ondelete="cascade",
+        help="Empty when the inventory covers all products of the location.",
+    )
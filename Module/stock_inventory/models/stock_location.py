@@ -0,0 +1,33 @@
+# Copyright 2024 ForgeFlow S.L. (http://www.forgeflow.com)
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl.html).
+
+from odoo import api, models
+from odoo.osv import expression
+
+
+class StockLocation(models.Model):
+    _inherit = "stock.location"
+
+    def _get_scope_domain(self, field_name="id", include_children=True):
+        """Domain on ``field_name`` matching these locations and, unless
+        ``include_children`` is False, all their sublocations.
+
+        Sublocations are matched on ``parent_path`` prefixes, so the subtree
+        is resolved by the database instead of being loaded as a list of ids.
+        """
+        if not include_children:
+            return [(field_name, "in", self.ids)]
+        if not self:
+            return expression.FALSE_DOMAIN
+        path_field = (
+            "parent_path" if field_name == "id" else f"{field_name}.parent_path"
+        )
+        return expression.OR(
+            [[(path_field, "=like", f"{path}%")] for path in self.mapped("parent_path")]
+        )
+
+    @api.model
+    def _get_subtree_sql_condition(self, location_alias, root_alias):
+        """SQL condition matching when the location aliased ``location_alias``
+        is the location aliased ``root_alias`` or one of its sublocations."""
+        return f"{location_alias}.parent_path LIKE {root_alias}.parent_path || '%%'"
@@ -592,3 +592,160 @@ class TestStockInventory(BaseCommon):
             ).current_inventory_id,
             inventory2,
         )
+
+    def test_14_inventory_claims(self):
+        claim_model = self.env["stock.inventory.claim"]
+        inventory1 = self.inventory_model.create(
+            {
+                "name": "Inventory_Test_Claims_1",
+                "product_selection": "manual",
+                "location_ids": [self.location1.id],
+                "product_ids": [self.product.id],
+            }
+        )
+        inventory1.action_state_to_in_progress()
+        claims = claim_model.search([("inventory_id", "=", inventory1.id)])
+        self.assertEqual(claims.location_id, self.location1)
+        self.assertEqual(claims.product_id, self.product)
+        self.assertTrue(claims.include_children)
+        self.assertEqual(self.quant3.current_inventory_id, inventory1)
+        self.assertTrue(self.quant3.to_do)
+        # Quant of a sublocation is claimed through the parent location
+        inventory2 = self.inventory_model.create(
+            {
+                "name": "Inventory_Test_Claims_2",
+                "product_selection": "all",
+                "location_ids": [self.location3.id],
+            }
+        )
+        with self.assertRaisesRegex(ValidationError, "Inventory_Test_Claims_1"):
+            inventory2.action_state_to_in_progress()
+        inventory1.action_state_to_done()
+        self.assertFalse(claim_model.search([("inventory_id", "=", inventory1.id)]))
+        inventory2.action_state_to_in_progress()
+        self.assertEqual(inventory2.state, "in_progress")
+
+    def test_15_location_scope_domain(self):
+        locations = self.location1 | self.location2
+        domain = locations._get_scope_domain("location_id")
+        self.assertEqual(
+            self.quant_model.search(domain + [("product_id", "=", self.product.id)]),
+            self.quant1 | self.quant2 | self.quant3,
+        )
+        domain = self.location1._get_scope_domain(
+            "location_id", include_children=False
+        )
+        self.assertEqual(
+            self.quant_model.search(domain + [("product_id", "=", self.product.id)]),
+            self.quant1,
+        )
+        self.assertEqual(
+            self.location_model.search(self.location1._get_scope_domain()),
+            self.location1 | self.location3,
+        )
+
+    def test_16_apply_links_moves(self):
+        inventory1 = self.inventory_model.create(
+            {
+                "name": "Inventory_Test_Links",
+                "product_selection": "all",
+                "location_ids": [self.location1.id],
+            }
+        )
+        inventory1.action_state_to_in_progress()
+        quants = self.quant1 | self.quant3
+        quants.inventory_quantity = 50
+        quants.action_apply_inventory()
+        inventory1.invalidate_recordset()
+        self.assertEqual(len(inventory1.stock_move_ids), 2)
+        self.assertEqual(inventory1.stock_move_ids.lot_id, self.lot_1 | self.lot_3)
+        for move_line in inventory1.stock_move_ids:
+            self.assertTrue(move_line.reference.startswith("Inventory_Test_Links"))
+        self.assertFalse(quants.filtered("to_do"))
+        self.assertFalse(quants.current_inventory_id)
+
+    def test_17_apply_inventory_in_batches(self):
+        self.env.company.stock_inventory_apply_batch_size = 1
+        inventory1 = self.inventory_model.create(
+            {
+                "name": "Inventory_Test_Batches",
+                "product_selection": "all",
+                "location_ids": [self.location1.id],
+            }
+        )
+        inventory1.action_state_to_in_progress()
+        quants = self.quant1 | self.quant3
+        quants.inventory_quantity = 50
+        inventory1.action_apply_inventory_in_batches()
+        self.assertEqual(inventory1.apply_state, "queued")
+        self.assertEqual(inventory1.apply_total, 2)
+        self.inventory_model._cron_apply_inventory_batches()
+        self.assertEqual(inventory1.apply_done, 1)
+        self.assertEqual(inventory1.apply_progress, 50)
+        self.assertEqual(len(quants.filtered("to_do")), 1)
+        self.inventory_model._cron_apply_inventory_batches()
+        self.assertEqual(inventory1.apply_state, "done")
+        self.assertEqual(inventory1.apply_done, 2)
+        self.assertEqual(quants.mapped("quantity"), [50, 50])
+        self.assertEqual(len(inventory1.stock_move_ids), 2)
+        # The quant that was not counted is left untouched
+        self.assertTrue(self.quant4.to_do)
+
+    def test_18_scanned_counts(self):
+        self.product.barcode = "SCAN-PRODUCT-1"
+        self.location1.barcode = "SCAN-LOC-1"
+        self.location3.barcode = "SCAN-LOC-3"
+        inventory1 = self.inventory_model.create(
+            {
+                "name": "Inventory_Test_Scans",
+                "product_selection": "all",
+                "location_ids": [self.location1.id],
+            }
+        )
+        inventory1.action_state_to_in_progress()
+        lines = [
+            {"barcode": "SCAN-PRODUCT-1", "location": "SCAN-LOC-1", "lot": "Lot 1"},
+            {"barcode": "SCAN-PRODUCT-1", "location": "SCAN-LOC-3", "lot": "Lot 3"},
+            {"barcode": "SCAN-PRODUCT-1", "location": "SCAN-LOC-3", "lot": "Lot 3"},
+            {"barcode": "UNKNOWN", "location": "SCAN-LOC-1"},
+            {"barcode": "SCAN-PRODUCT-1", "location": "SCAN-LOC-1", "lot": "Lot 2"},
+        ]
+        for line, quantity in zip(lines, [5, 2, 3, 1, 1], strict=True):
+            line["quantity"] = quantity
+        result = inventory1._apply_scanned_counts(lines)
+        self.assertEqual(result["counted"], 2)
+        self.assertEqual(
+            result["conflicts"],
+            [
+                {"index": 3, "reason": "unknown_product"},
+                {"index": 4, "reason": "not_in_inventory"},
+            ],
+        )
+        self.assertEqual(self.quant1.inventory_quantity, 5)
+        self.assertTrue(self.quant1.inventory_quantity_set)
+        self.assertEqual(self.quant3.inventory_quantity, 5)
+        self.assertEqual(self.quant3.inventory_diff_quantity, -95)
+        result = inventory1._apply_scanned_counts(lines[:1], mode="add")
+        self.assertEqual(self.quant1.inventory_quantity, 10)
+
+    def test_19_apply_inventory_in_batches_outdated(self):
+        inventory1 = self.inventory_model.create(
+            {
+                "name": "Inventory_Test_Batches_Outdated",
+                "product_selection": "all",
+                "location_ids": [self.location1.id],
+            }
+        )
+        inventory1.action_state_to_in_progress()
+        self.quant1.inventory_quantity = 50
+        # The stock moves after the count, which is now outdated
+        self.quant_model._update_available_quantity(
+            self.product, self.location1, 10, lot_id=self.lot_1
+        )
+        inventory1.action_apply_inventory_in_batches()
+        self.inventory_model._cron_apply_inventory_batches()
+        self.assertEqual(inventory1.apply_state, "failed")
+        self.assertIn("changed since they were counted", inventory1.apply_error)
+        self.assertEqual(inventory1.apply_done, 0)
+        self.assertEqual(self.quant1.quantity, 110)
+        self.assertTrue(self.quant1.to_do)
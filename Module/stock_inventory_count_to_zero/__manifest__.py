@@ -3,7 +3,7 @@
 {
     "name": "Stock Inventory Count To Zero",
     "summary": "Request an inventory count filling the quantities to zero as default",
-    "version": "18.0.1.0.0",
+    "version": "18.0.1.1.0",
     "development_status": "Beta",
     "category": "Inventory/Inventory",
     "website": "https://github.com/OCA/stock-logistics-warehouse",
@@ -11,4 +11,8 @@
     "license": "AGPL-3",
     "installable": True,
     "depends": ["stock"],
+    "data": [
+        "security/ir.model.access.csv",
+        "wizards/stock_inventory_zero_count_views.xml",
+    ],
 }
@@ -1,6 +1,11 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
-from odoo import _, models
+import logging
+
+from odoo import _, api, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
 
 
 class StockQuant(models.Model):
@@ -21,10 +26,46 @@ class StockQuant(models.Model):
                 "target": "new",
                 "context": ctx,
             }
-        self.update(
-            {
-                "inventory_quantity": 0.0,
-                "user_id": self.env.user.id,
-                "inventory_quantity_set": True,
-            }
+        self._set_inventory_quantity_zero([("id", "in", self.ids)])
+
+    @api.model
+    def _set_inventory_quantity_zero(self, domain):
+        """Set the counted quantity of the quants matching ``domain`` to zero
+        on behalf of the current user, with one UPDATE statement. As the
+        UPDATE bypasses the ORM tracking, the operation is logged with the
+        number of quants and their locations.
+
+        Return the number of quants set to zero.
+        """
+        fnames = ["inventory_quantity", "inventory_quantity_set", "user_id"]
+        self.flush_model(fnames)
+        query = self._search(domain)
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE stock_quant
+                   SET inventory_quantity = 0,
+                       inventory_quantity_set = TRUE,
+                       user_id = %(uid)s,
+                       write_uid = %(uid)s,
+                       write_date = NOW() AT TIME ZONE 'UTC'
+                 WHERE id IN %(quant_ids)s
+             RETURNING id
+                """,
+                uid=self.env.uid,
+                quant_ids=query.subselect(),
+            )
+        )
+        quants = self.browse([row[0] for row in self.env.cr.fetchall()])
+        quants.invalidate_recordset(fnames + ["write_uid", "write_date"])
+        quants.modified(fnames)
+        # The domain itself is not logged, it can hold thousands of ids
+        _logger.info(
+            "User %s (#%s) set the counted quantity of %s quants to zero "
+            "in the locations %s",
+            self.env.user.login,
+            self.env.uid,
+            len(quants),
+            ", ".join(quants.location_id.mapped("complete_name")),
         )
+        return len(quants)
@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 from freezegun import freeze_time
 
+from odoo.exceptions import UserError
 from odoo.tests import TransactionCase, tagged
 
 
@@ -41,3 +42,87 @@ class TestStockInventoryCountZero(TransactionCase):
         )
         self.assertEqual(quants.inventory_quantity, 0.0)
         self.assertEqual(quants.inventory_diff_quantity, -10.0)
+
+    def test_zero_count_wizard_location(self):
+        location = self.env["stock.location"].create(
+            {
+                "name": "Zero bin",
+                "usage": "internal",
+                "location_id": self.warehouse.lot_stock_id.id,
+            }
+        )
+        StockQuant = self.env["stock.quant"]
+        product = self.product_template.product_variant_ids[0]
+        quant_bin = StockQuant.create(
+            {"product_id": product.id, "location_id": location.id, "quantity": 4.0}
+        )
+        counted_quant = StockQuant.create(
+            {
+                "product_id": self.env["product.product"]
+                .create({"name": "Counted product", "is_storable": True})
+                .id,
+                "location_id": location.id,
+                "quantity": 3.0,
+            }
+        )
+        counted_quant.with_context(inventory_mode=True).inventory_quantity = 2.0
+        wiz = (
+            self.env["stock.inventory.zero.count"]
+            .with_context(active_model="stock.location", active_ids=location.ids)
+            .create({})
+        )
+        self.assertEqual(wiz.quant_count, 2)
+        self.assertEqual(wiz.already_set_count, 1)
+        wiz.action_apply()
+        self.assertEqual(quant_bin.inventory_quantity, 0.0)
+        self.assertTrue(quant_bin.inventory_quantity_set)
+        self.assertEqual(quant_bin.user_id, self.env.user)
+        self.assertEqual(quant_bin.inventory_diff_quantity, -4.0)
+        self.assertEqual(counted_quant.inventory_quantity, 2.0)
+        # The quant of the parent location is out of scope
+        self.assertFalse(self.quant.inventory_quantity_set)
+
+    def test_zero_count_wizard_scope(self):
+        wiz = self.env["stock.inventory.zero.count"].create({})
+        with self.assertRaises(UserError):
+            wiz.action_apply()
+        self.assertFalse(self.quant.inventory_quantity_set)
+        # Ticked rows of a filtered list only affect the selected quants
+        other_quant = self.env["stock.quant"].create(
+            {
+                "product_id": self.env["product.product"]
+                .create({"name": "Other product", "is_storable": True})
+                .id,
+                "location_id": self.warehouse.lot_stock_id.id,
+                "quantity": 1.0,
+            }
+        )
+        wiz = (
+            self.env["stock.inventory.zero.count"]
+            .with_context(
+                active_model="stock.quant",
+                active_ids=self.quant.ids,
+                active_domain=[("location_id", "=", self.warehouse.lot_stock_id.id)],
+            )
+            .create({})
+        )
+        self.assertEqual(wiz.quant_count, 1)
+        wiz.action_apply()
+        self.assertTrue(self.quant.inventory_quantity_set)
+        self.assertFalse(other_quant.inventory_quantity_set)
+        # The list filter is only used by the action asking for it
+        wiz = (
+            self.env["stock.inventory.zero.count"]
+            .with_context(
+                active_model="stock.quant",
+                active_ids=self.quant.ids,
+                active_domain=[
+                    ("product_id", "in", (self.quant | other_quant).product_id.ids)
+                ],
+                zero_count_selection="domain",
+            )
+            .create({"overwrite_counted": True})
+        )
+        self.assertEqual(wiz.quant_count, 2)
+        wiz.action_apply()
+        self.assertTrue(other_quant.inventory_quantity_set)
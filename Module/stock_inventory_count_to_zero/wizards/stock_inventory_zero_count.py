@@ -0,0 +1,109 @@
+# Copyright 2025 Tecnativa - Sergio Teruel
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+from odoo.osv import expression
+from odoo.tools.safe_eval import safe_eval
+
+
+class StockInventoryZeroCount(models.TransientModel):
+    _name = "stock.inventory.zero.count"
+    _description = "Set inventory counts to zero"
+
+    location_ids = fields.Many2many(
+        "stock.location",
+        string="Locations",
+        domain="[('usage', 'in', ('internal', 'transit'))]",
+    )
+    include_sublocations = fields.Boolean(default=True)
+    quant_domain = fields.Char(
+        string="Quants Filter",
+        default="[]",
+        help="Additional domain on the quants to set to zero.",
+    )
+    overwrite_counted = fields.Boolean(
+        string="Overwrite Counted Quantities",
+        help="Also set to zero the quants that already have a counted quantity.",
+    )
+    quant_count = fields.Integer(compute="_compute_quant_counts")
+    already_set_count = fields.Integer(
+        string="Already Counted", compute="_compute_quant_counts"
+    )
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        context = self.env.context
+        if context.get("active_model") == "stock.location" and context.get(
+            "active_ids"
+        ):
+            res["location_ids"] = [(6, 0, context["active_ids"])]
+        elif context.get("active_model") == "stock.quant":
+            # The list filter is only used when explicitly asked for by the
+            # action, the ticked rows are used otherwise
+            if context.get("zero_count_selection") == "domain":
+                res["quant_domain"] = repr(context.get("active_domain") or [])
+            elif context.get("active_ids"):
+                res["quant_domain"] = repr([("id", "in", context["active_ids"])])
+        return res
+
+    def _get_quant_domain(self):
+        self.ensure_one()
+        domain = [
+            ("location_id.usage", "in", ["internal", "transit"]),
+            ("company_id", "in", self.env.companies.ids),
+        ]
+        if self.location_ids:
+            if self.include_sublocations:
+                domain = expression.AND(
+                    [
+                        domain,
+                        expression.OR(
+                            [
+                                [("location_id.parent_path", "=like", f"{path}%")]
+                                for path in self.location_ids.mapped("parent_path")
+                            ]
+                        ),
+                    ]
+                )
+            else:
+                domain = expression.AND(
+                    [domain, [("location_id", "in", self.location_ids.ids)]]
+                )
+        return expression.AND([domain, safe_eval(self.quant_domain or "[]")])
+
+    @api.depends("location_ids", "include_sublocations", "quant_domain")
+    def _compute_quant_counts(self):
+        quant_model = self.env["stock.quant"]
+        for wizard in self:
+            domain = wizard._get_quant_domain()
+            wizard.already_set_count = quant_model.search_count(
+                expression.AND([domain, [("inventory_quantity_set", "=", True)]])
+            )
+            wizard.quant_count = quant_model.search_count(domain)
+
+    def action_apply(self):
+        self.ensure_one()
+        if not self.location_ids and not safe_eval(self.quant_domain or "[]"):
+            raise UserError(
+                self.env._(
+                    "Select at least one location or set a quants filter "
+                    "before setting counts to zero."
+                )
+            )
+        domain = self._get_quant_domain()
+        if not self.overwrite_counted:
+            domain = expression.AND([domain, [("inventory_quantity_set", "=", False)]])
+        count = self.env["stock.quant"]._set_inventory_quantity_zero(domain)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "type": "success",
+                "message": self.env._(
+                    "%(count)s quants have been set to zero.", count=count
+                ),
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
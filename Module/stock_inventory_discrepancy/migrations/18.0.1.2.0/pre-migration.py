@@ -0,0 +1,34 @@
+# Copyright 2024 ForgeFlow S.L. (http://www.forgeflow.com)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+
+def migrate(cr, version):
+    """Fill the now stored threshold and over-discrepancy flag in SQL, so the
+    registry update does not recompute every quant through the ORM."""
+    cr.execute(
+        """
+        ALTER TABLE stock_quant
+            ADD COLUMN IF NOT EXISTS discrepancy_threshold numeric,
+            ADD COLUMN IF NOT EXISTS has_over_discrepancy boolean
+        """
+    )
+    cr.execute(
+        """
+        UPDATE stock_quant q
+           SET discrepancy_threshold = CASE
+                   WHEN l.discrepancy_threshold > 0 THEN l.discrepancy_threshold
+                   WHEN w.discrepancy_threshold > 0 THEN w.discrepancy_threshold
+                   ELSE 0
+               END
+          FROM stock_location l
+          LEFT JOIN stock_warehouse w ON w.id = l.warehouse_id
+         WHERE l.id = q.location_id
+        """
+    )
+    cr.execute(
+        """
+        UPDATE stock_quant
+           SET has_over_discrepancy = COALESCE(discrepancy_percent, 0)
+               > COALESCE(discrepancy_threshold, 0)
+        """
+    )
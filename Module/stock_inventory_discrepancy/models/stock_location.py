@@ -24,13 +24,37 @@ class StockLocation(models.Model):
         res = super().write(values)
         # Set the discrepancy threshold for all child locations
         if values.get("discrepancy_threshold", False):
-            for location in self.filtered(
+            self.filtered(
                 lambda loc: loc.propagate_discrepancy_threshold and loc.child_ids
-            ):
-                location.child_ids.write(
-                    {
-                        "discrepancy_threshold": values["discrepancy_threshold"],
-                        "propagate_discrepancy_threshold": True,
-                    }
-                )
+            )._propagate_discrepancy_threshold(values["discrepancy_threshold"])
         return res
+
+    def _propagate_discrepancy_threshold(self, threshold):
+        """Copy the threshold to every descendant of these locations with a
+        single statement on ``parent_path``, then let the ORM recompute the
+        thresholds and flags of the quants in the subtree as one batch."""
+        if not self:
+            return
+        self.flush_model(["parent_path"])
+        self.env.cr.execute(
+            """
+            UPDATE stock_location
+               SET discrepancy_threshold = %(threshold)s,
+                   propagate_discrepancy_threshold = TRUE,
+                   write_uid = %(uid)s,
+                   write_date = (now() at time zone 'UTC')
+             WHERE parent_path LIKE ANY(%(prefixes)s)
+               AND id NOT IN %(root_ids)s
+         RETURNING id
+            """,
+            {
+                "threshold": threshold,
+                "uid": self.env.uid,
+                "prefixes": [f"{loc.parent_path}%" for loc in self],
+                "root_ids": tuple(self.ids),
+            },
+        )
+        children = self.browse([row[0] for row in self.env.cr.fetchall()])
+        fnames = ["discrepancy_threshold", "propagate_discrepancy_threshold"]
+        children.invalidate_recordset(fnames + ["write_uid", "write_date"])
+        children.modified(fnames)
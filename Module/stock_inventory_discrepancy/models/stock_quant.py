@@ -22,32 +22,17 @@ class StockQuant(models.Model):
         digits=(3, 2),
         help="Maximum Discrepancy Rate Threshold",
         compute="_compute_discrepancy_threshold",
+        store=True,
+        compute_sudo=True,
     )
     has_over_discrepancy = fields.Boolean(
-        compute="_compute_has_over_discrepancy", search="_search_has_over_discrepancy"
+        compute="_compute_has_over_discrepancy",
+        store=True,
+        index=True,
+        compute_sudo=True,
     )
 
-    def _search_has_over_discrepancy(self, operator, value):
-        if operator not in ["=", "!="]:
-            raise UserError(_("This operator is not supported"))
-        if value == "True":
-            value = True
-        elif value == "False":
-            value = False
-        if not isinstance(value, bool):
-            raise UserError(_("Value should be True or False (not %s)") % value)
-        ids = []
-        for quant in self.search([]):
-            has_over_discrepancy = (
-                quant.discrepancy_percent > quant.location_id.discrepancy_threshold
-            )
-            if (operator == "=" and has_over_discrepancy == value) or (
-                operator == "!=" and has_over_discrepancy != value
-            ):
-                ids.append(quant.id)
-        return [("id", "in", ids)]
-
-    @api.depends("quantity", "inventory_quantity")
+    @api.depends("quantity", "inventory_quantity", "inventory_quantity_set")
     def _compute_discrepancy(self):
         for quant in self:
             if not quant.quantity or not quant.inventory_quantity_set:
@@ -57,6 +42,10 @@ class StockQuant(models.Model):
                     100 * (quant.inventory_diff_quantity) / quant.quantity
                 )
 
+    @api.depends(
+        "location_id.discrepancy_threshold",
+        "location_id.warehouse_id.discrepancy_threshold",
+    )
     def _compute_discrepancy_threshold(self):
         for quant in self:
             whs = quant.location_id.warehouse_id
@@ -67,6 +56,7 @@ class StockQuant(models.Model):
             else:
                 quant.discrepancy_threshold = False
 
+    @api.depends("discrepancy_percent", "discrepancy_threshold")
     def _compute_has_over_discrepancy(self):
         for rec in self:
             rec.has_over_discrepancy = (
@@ -190,3 +190,63 @@ class TestInventoryDiscrepancy(BaseCommon):
             0.3,
             "Threshold Discrepancy wrongly propagated",
         )
+
+    def test_has_over_discrepancy_stored(self):
+        """The flag is stored and follows threshold changes on the location."""
+        self.quant_line1.inventory_quantity = 3.0
+        self.quant_line2.inventory_quantity = 4.1
+        over_quants = self.obj_quant.search(
+            [
+                ("location_id", "=", self.test_loc.id),
+                ("has_over_discrepancy", "=", True),
+            ]
+        )
+        self.assertEqual(over_quants, self.quant_line1)
+        self.test_loc.discrepancy_threshold = 60
+        self.assertEqual(self.quant_line1.discrepancy_threshold, 60)
+        self.assertFalse(
+            self.obj_quant.search_count(
+                [
+                    ("location_id", "=", self.test_loc.id),
+                    ("has_over_discrepancy", "=", True),
+                ]
+            )
+        )
+
+    def test_propagate_discrepancy_threshold_subtree(self):
+        """Propagation reaches every level and refreshes the quant flags."""
+        view_test_loc = self.obj_location.create(
+            {"name": "Test View", "usage": "view", "discrepancy_threshold": 0.1}
+        )
+        child_test_loc = self.obj_location.create(
+            {
+                "name": "Child Test Location",
+                "usage": "internal",
+                "location_id": view_test_loc.id,
+            }
+        )
+        grandchild_test_loc = self.obj_location.create(
+            {
+                "name": "Grandchild Test Location",
+                "usage": "internal",
+                "discrepancy_threshold": 5,
+                "location_id": child_test_loc.id,
+            }
+        )
+        quant = self.obj_quant.create(
+            {
+                "product_id": self.product1.id,
+                "quantity": 10.0,
+                "location_id": grandchild_test_loc.id,
+            }
+        )
+        quant.inventory_quantity = 12.0
+        self.assertTrue(quant.has_over_discrepancy)
+        view_test_loc.write(
+            {"discrepancy_threshold": 30, "propagate_discrepancy_threshold": True}
+        )
+        self.assertEqual(child_test_loc.discrepancy_threshold, 30)
+        self.assertEqual(grandchild_test_loc.discrepancy_threshold, 30)
+        self.assertTrue(grandchild_test_loc.propagate_discrepancy_threshold)
+        self.assertEqual(quant.discrepancy_threshold, 30)
+        self.assertFalse(quant.has_over_discrepancy)
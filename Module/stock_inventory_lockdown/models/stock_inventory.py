@@ -5,39 +5,96 @@
 
 from odoo import api, models
 
+LOCK_CACHE_KEY = "stock_inventory_lockdown.locks"
+
 
 class StockInventory(models.Model):
     _inherit = "stock.inventory"
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self._invalidate_location_locks()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"state", "location_ids", "exclude_sublocation"} & set(vals):
+            self._invalidate_location_locks()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._invalidate_location_locks()
+        return res
+
+    @api.model
+    def _invalidate_location_locks(self):
+        self.env.cr.cache.pop(LOCK_CACHE_KEY, None)
+
+    @api.model
+    def _get_location_locks(self):
+        """Return the locations locked by in-progress inventories.
+
+        The result is computed once per transaction with a single query and
+        kept until an inventory or a location changes. It is a pair of
+        dicts: locked location id -> ids of the inventories locking it, and
+        inventory id -> ids of its internal/transit locations.
+        """
+        locks = self.env.cr.cache.get(LOCK_CACHE_KEY)
+        if locks is not None:
+            return locks
+        self.flush_model(["state", "location_ids", "exclude_sublocation"])
+        self.env["stock.location"].flush_model(["parent_path", "usage"])
+        location_field = self._fields["location_ids"]
+        sublocation_condition = self.env[
+            "stock.location"
+        ]._get_subtree_sql_condition("sub", "il")
+        # A location is locked when it is one of the inventory locations, or
+        # an internal sublocation of one unless sublocations are excluded.
+        self.env.cr.execute(
+            f"""
+            SELECT i.id, il.id, il.usage IN ('internal', 'transit'), sub.id
+              FROM stock_inventory i
+              JOIN {location_field.relation} rel
+                ON rel.{location_field.column1} = i.id
+              JOIN stock_location il ON il.id = rel.{location_field.column2}
+              JOIN stock_location sub
+                ON sub.id = il.id
+                OR (NOT COALESCE(i.exclude_sublocation, FALSE)
+                    AND sub.usage = 'internal'
+                    AND {sublocation_condition})
+             WHERE i.state = 'in_progress'
+            """,
+            {},
+        )
+        inventories_by_location = {}
+        locations_by_inventory = {}
+        rows = self.env.cr.fetchall()
+        for inventory_id, location_id, lockable, sublocation_id in rows:
+            inventories_by_location.setdefault(sublocation_id, set()).add(inventory_id)
+            inventory_locations = locations_by_inventory.setdefault(inventory_id, set())
+            if lockable:
+                inventory_locations.add(location_id)
+        locks = (inventories_by_location, locations_by_inventory)
+        self.env.cr.cache[LOCK_CACHE_KEY] = locks
+        # Other transactions may change inventories once this one ends
+        self.env.cr.postcommit.add(self._invalidate_location_locks)
+        self.env.cr.postrollback.add(self._invalidate_location_locks)
+        return locks
+
     @api.model
     def _get_locations_open_inventories(self, locations_ids=None):
         if not locations_ids:
             return []
-        inventory_domain_same_location = [
-            ("state", "=", "in_progress"),
-            ("location_ids", "in", locations_ids),
-        ]
-        inventories_same_location = self.search(inventory_domain_same_location)
-        inventory_domain_parent = [
-            ("state", "=", "in_progress"),
-            ("exclude_sublocation", "=", False),
-        ]
-        inventories_possible_parent = self.search(inventory_domain_parent)
-        inventories_parent = self.env["stock.inventory"]
-        for inventory in inventories_possible_parent:
-            for location in inventory.location_ids:
-                if any(
-                    location_id in location.child_internal_location_ids.ids
-                    for location_id in locations_ids
-                ):
-                    inventories_parent |= inventory
-        inventories = inventories_same_location | inventories_parent
-        if not inventories:
+        inventories_by_location, locations_by_inventory = self._get_location_locks()
+        inventory_ids = set()
+        for location_id in locations_ids:
+            inventory_ids |= inventories_by_location.get(location_id, set())
+        if not inventory_ids:
             # Early exit if no match found
             return []
-        location_ids = inventories.mapped("location_ids")
-        location_domain = [
-            ("id", "in", location_ids.ids),
-            ("usage", "in", ["internal", "transit"]),
-        ]
-        return self.env["stock.location"].search(location_domain)
+        location_ids = set()
+        for inventory_id in inventory_ids:
+            location_ids |= locations_by_inventory[inventory_id]
+        return self.env["stock.location"].browse(sorted(location_ids))
@@ -8,6 +8,18 @@ from odoo.exceptions import ValidationError
 class StockLocation(models.Model):
     _inherit = "stock.location"
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        # New sublocations of a locked location are locked too
+        self.env["stock.inventory"]._invalidate_location_locks()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if {"location_id", "usage"} & set(vals):
+            # Before the location constraint below checks the new tree
+            self.env["stock.inventory"]._invalidate_location_locks()
+        return super().write(vals)
+
     @api.constrains("location_id")
     def _check_inventory_location_id(self):
         vals = set(self.ids) | set(self.mapped("location_id").ids)
@@ -20,18 +20,20 @@ class StockMoveLine(models.Model):
 
     @api.constrains("location_dest_id", "location_id", "state")
     def _check_locked_location(self):
+        inventory_model = self.env["stock.inventory"]
         for move_line in self.filtered(lambda m: m.state == "done"):
-            locked_location_ids = self.env[
-                "stock.inventory"
-            ]._get_locations_open_inventories(
-                [move_line.location_dest_id.id, move_line.location_id.id]
-            )
-            if locked_location_ids and not any(
+            if any(
                 [
                     move_line.location_dest_id.usage == "inventory",
                     move_line.location_id.usage == "inventory",
                 ]
             ):
+                continue
+            # Resolved from the per-transaction lock cache
+            locked_location_ids = inventory_model._get_locations_open_inventories(
+                [move_line.location_dest_id.id, move_line.location_id.id]
+            )
+            if locked_location_ids:
                 location_names = locked_location_ids.mapped("complete_name")
                 raise ValidationError(
                     self.env._(
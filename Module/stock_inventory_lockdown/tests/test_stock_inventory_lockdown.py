@@ -174,3 +174,24 @@ class StockInventoryLocationTest(TestStockCommon):
         )
         with self.assertRaises(ValidationError):
             inventory.location_ids.unlink()
+
+    def test_lock_cache_invalidation(self):
+        """Locks follow inventory states and new sublocations within a transaction"""
+        inventory_model = self.env["stock.inventory"]
+        self.assertIn(
+            self.new_location,
+            inventory_model._get_locations_open_inventories([self.new_sublocation.id]),
+        )
+        new_bin = self.env["stock.location"].create(
+            {
+                "name": "Test bin",
+                "usage": "internal",
+                "location_id": self.new_sublocation.id,
+            }
+        )
+        self.assertIn(
+            self.new_location,
+            inventory_model._get_locations_open_inventories([new_bin.id]),
+        )
+        self.inventory.action_state_to_draft()
+        self.assertFalse(inventory_model._get_locations_open_inventories([new_bin.id]))
@@ -4,6 +4,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 from odoo import fields, models
+from odoo.osv import expression
 from odoo.tools.safe_eval import safe_eval
 
 
@@ -29,18 +30,25 @@ class StockInventory(models.Model):
 
     def _prepare_inventory_filter(self):
         # This method is designed to be inherited by other modules
-        # such as the OCA module stock_inventory_preparation_filter_pos
+        # such as the OCA module stock_inventory_preparation_filter_pos.
+        # The "domain" selection is not materialised into products: it is
+        # applied as a subquery when searching the quants.
         self.ensure_one()
-        Product = self.env["product.product"]
-        products = Product
-        if self.product_selection == "domain":
-            domain = safe_eval(self.product_domain)
-            products = Product.search(domain)
-        return products
+        return self.env["product.product"]
+
+    def _get_domain_product_domain_quants(self, base_domain):
+        self.ensure_one()
+        return expression.AND(
+            [
+                base_domain,
+                [("product_id", "any", safe_eval(self.product_domain or "[]"))],
+            ]
+        )
 
     def _get_quants(self, locations):
         if self.product_selection == "domain":
-            domain = safe_eval(self.product_domain)
-            products = self.env["product.product"].search(domain)
-            return self.env["stock.quant"].search([("product_id", "in", products.ids)])
+            base_domain = self._get_base_domain(locations)
+            return self.env["stock.quant"].search(
+                self._get_domain_product_domain_quants(base_domain)
+            )
         return super()._get_quants(locations)
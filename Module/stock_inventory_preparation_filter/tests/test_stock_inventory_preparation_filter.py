@@ -146,3 +146,24 @@ class TestStockInventoryPreparationFilterCategories(BaseCommon):
         line1 = inventory.stock_quant_ids[0]
         self.assertEqual(line1.product_id, self.product1)
         self.assertEqual(line1.quantity, 2.0)
+
+    def test_inventory_domain_filter_location_scope(self):
+        self.env["stock.quant"].create(
+            {
+                "product_id": self.product1.id,
+                "location_id": self.location.id,
+                "quantity": 5.0,
+            }
+        )
+        inventory = self.inventory_model.create(
+            {
+                "name": "Domain inventory scoped",
+                "product_selection": "domain",
+                "product_domain": [("categ_id", "=", self.category.id)],
+                "location_ids": self.location,
+            }
+        )
+        inventory.action_state_to_in_progress()
+        self.assertEqual(inventory.stock_quant_ids.product_id, self.product1)
+        self.assertEqual(inventory.stock_quant_ids.location_id, self.location)
+        self.assertFalse(inventory.product_ids)
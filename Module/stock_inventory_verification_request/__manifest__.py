@@ -6,7 +6,7 @@
     "name": "Stock Inventory Verification Request",
     "summary": "Adds the capability to request a Slot Verification when "
     "a inventory is Pending to Approve",
-    "version": "18.0.1.2.0",
+    "version": "18.0.1.3.0",
     "maintainers": ["LoisRForgeFlow"],
     "author": "ForgeFlow, " "Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/stock-logistics-warehouse",
@@ -23,6 +23,7 @@
         "views/stock_slot_verification_request_view.xml",
         "views/stock_inventory_view.xml",
         "views/stock_location_view.xml",
+        "report/stock_inventory_discrepancy_report_views.xml",
         "data/slot_verification_request_sequence.xml",
     ],
     "license": "AGPL-3",
@@ -44,6 +44,10 @@ class StockQuant(models.Model):
                 record.discrepancy_percent > record.discrepancy_threshold
             )
 
+    def _apply_inventory(self):
+        self.env["stock.inventory.discrepancy.report"]._record_counts(self)
+        return super()._apply_inventory()
+
     def action_open_svr(self):
         """Open the corresponding Slot Verification Request directly from the
         stock quant."""
@@ -63,22 +67,25 @@ class StockQuant(models.Model):
         return action
 
     def action_request_verification(self):
-        for quant in self:
-            if quant.discrepancy_threshold and (
-                quant.discrepancy_percent > quant.discrepancy_threshold
-            ):
-                self.env["stock.slot.verification.request"].create(
-                    {
-                        "quant_id": quant.id,
-                        "location_id": quant.location_id.id,
-                        "state": "wait",
-                        "product_id": quant.product_id.id,
-                        "company_id": quant.company_id.id,
-                        "lot_id": quant.lot_id.id if quant.lot_id else False,
-                        "inventory_id": quant.current_inventory_id.id
-                        if quant.current_inventory_id
-                        else False,
-                    }
-                )
-                quant.requested_verification = True
+        quants = self.filtered(
+            lambda quant: quant.discrepancy_threshold
+            and quant.discrepancy_percent > quant.discrepancy_threshold
+        )
+        self.env["stock.slot.verification.request"].create(
+            [
+                {
+                    "quant_id": quant.id,
+                    "location_id": quant.location_id.id,
+                    "state": "wait",
+                    "product_id": quant.product_id.id,
+                    "company_id": quant.company_id.id,
+                    "lot_id": quant.lot_id.id if quant.lot_id else False,
+                    "inventory_id": quant.current_inventory_id.id
+                    if quant.current_inventory_id
+                    else False,
+                }
+                for quant in quants
+            ]
+        )
+        quants.requested_verification = True
         return {"type": "ir.actions.act_window_close"}
@@ -3,7 +3,14 @@
 # Copyright 2025 OERP Canada <https://www.oerp.ca>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+from dateutil.relativedelta import relativedelta
+
 from odoo import api, fields, models
+from odoo.osv import expression
+
+# Default history window and page size of the involved move lines
+INVOLVED_MOVE_LINES_DAYS = 365
+INVOLVED_MOVE_LINES_LIMIT = 80
 
 
 class SlotVerificationRequest(models.Model):
@@ -13,27 +20,76 @@ class SlotVerificationRequest(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if not vals.get("name") or vals.get("name") == "/":
-                vals["name"] = (
-                    self.env["ir.sequence"].next_by_code(
-                        "stock.slot.verification.request"
-                    )
-                    or "/"
-                )
+        vals_to_name = [
+            vals for vals in vals_list if not vals.get("name") or vals["name"] == "/"
+        ]
+        names = self._reserve_names(len(vals_to_name))
+        for vals, name in zip(vals_to_name, names, strict=True):
+            vals["name"] = name
         return super().create(vals_list)
 
+    @api.model
+    def _reserve_names(self, count):
+        """Draw ``count`` names from the SVR sequence at once.
+
+        Standard sequences are backed by a PostgreSQL sequence, so all the
+        numbers are reserved with a single ``nextval`` query; other
+        implementations fall back to one ``next_by_code`` call per name.
+        """
+        if not count:
+            return []
+        code = "stock.slot.verification.request"
+        sequence = self.env["ir.sequence"].search(
+            [
+                ("code", "=", code),
+                ("company_id", "in", [self.env.company.id, False]),
+            ],
+            order="company_id",
+            limit=1,
+        )
+        if (
+            not sequence
+            or sequence.implementation != "standard"
+            or sequence.use_date_range
+        ):
+            sequence_model = self.env["ir.sequence"]
+            return [sequence_model.next_by_code(code) or "/" for __ in range(count)]
+        self.env.cr.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            [f"ir_sequence_{sequence.id:03d}", count],
+        )
+        sequence = sequence.sudo()
+        return [sequence.get_next_char(number) for (number,) in self.env.cr.fetchall()]
+
+    @api.depends("location_id", "product_id", "lot_id", "state", "involved_date_from")
     def _compute_involved_move_line_count(self):
+        move_line_model = self.env["stock.move.line"]
         for rec in self:
-            rec.involved_move_line_count = len(rec.involved_move_line_ids)
+            rec.involved_move_line_count = (
+                move_line_model.search_count(rec._get_involved_move_lines_domain())
+                if rec.state == "open"
+                else 0
+            )
 
+    @api.depends("location_id", "product_id", "lot_id", "state")
     def _compute_involved_quant_count(self):
+        quant_model = self.env["stock.quant"]
         for rec in self:
-            rec.involved_quant_count = len(rec.involved_quant_ids)
+            rec.involved_quant_count = (
+                quant_model.search_count(rec._get_involved_quants_domain())
+                if rec.state == "open"
+                else 0
+            )
 
     def _compute_created_inventory_count(self):
+        groups = self.env["stock.inventory"]._read_group(
+            [("solving_slot_verification_request_id", "in", self.ids)],
+            ["solving_slot_verification_request_id"],
+            ["__count"],
+        )
+        counts = {request.id: count for request, count in groups}
         for rec in self:
-            rec.created_inventory_count = len(rec.created_inventory_ids)
+            rec.created_inventory_count = counts.get(rec.id, 0)
 
     name = fields.Char(
         default="/",
@@ -95,6 +151,13 @@ class SlotVerificationRequest(models.Model):
         tracking=True,
     )
     notes = fields.Text()
+    involved_date_from = fields.Datetime(
+        string="Involved Moves Since",
+        default=lambda self: fields.Datetime.now()
+        - relativedelta(days=INVOLVED_MOVE_LINES_DAYS),
+        help="Only the product moves done since this date are reviewed. "
+        "Leave empty to review the whole history of the location.",
+    )
     involved_move_line_ids = fields.Many2many(
         comodel_name="stock.move.line",
         relation="slot_verification_move_involved_rel",
@@ -131,12 +194,16 @@ class SlotVerificationRequest(models.Model):
         help="User who has solved or cancelled the request.",
     )
 
-    @api.depends("location_id", "product_id", "lot_id", "state")
+    @api.depends("location_id", "product_id", "lot_id", "state", "involved_date_from")
     def _compute_involved_move_lines(self):
+        """Most recent involved move lines, the whole set is browsed
+        page by page through :meth:`action_view_move_lines`."""
         for rec in self:
             if rec.state == "open":
                 rec.involved_move_line_ids = self.env["stock.move.line"].search(
-                    rec._get_involved_move_lines_domain()
+                    rec._get_involved_move_lines_domain(),
+                    order="date desc, id desc",
+                    limit=INVOLVED_MOVE_LINES_LIMIT,
                 )
             else:
                 rec.involved_move_line_ids = self.env["stock.move.line"]
@@ -161,6 +228,8 @@ class SlotVerificationRequest(models.Model):
             domain.append(("product_id", "=", self.product_id.id))
         if self.lot_id:
             domain.append(("lot_id", "=", self.lot_id.id))
+        if self.involved_date_from:
+            domain.append(("date", ">=", self.involved_date_from))
         return domain
 
     def _get_involved_quants_domain(self):
@@ -201,9 +270,15 @@ class SlotVerificationRequest(models.Model):
         action = self.env.ref(
             "stock_inventory_verification_request.action_move_lines_svr"
         ).read()[0]
-        moves_ids = self.mapped("involved_move_line_ids").ids
         result = action
-        result["domain"] = [("id", "in", moves_ids)]
+        if self and all(rec.state == "open" for rec in self):
+            # Let the list view paginate the whole set of involved moves
+            result["domain"] = expression.OR(
+                [rec._get_involved_move_lines_domain() for rec in self]
+            )
+        else:
+            moves_ids = self.mapped("involved_move_line_ids").ids
+            result["domain"] = [("id", "in", moves_ids)]
         return result
 
     def action_view_quants(self):
@@ -0,0 +1 @@
+from . import stock_inventory_discrepancy_report
@@ -0,0 +1,127 @@
+# Copyright 2025 ForgeFlow S.L.
+#   (http://www.forgeflow.com)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+
+class StockInventoryDiscrepancyReport(models.Model):
+    """One line per applied count, recorded when the count is applied so the
+    discrepancy history can be analysed without reading the stock moves."""
+
+    _name = "stock.inventory.discrepancy.report"
+    _description = "Inventory Discrepancy Analysis"
+    _order = "date desc, id desc"
+    _rec_name = "product_id"
+
+    date = fields.Datetime(readonly=True, index=True)
+    company_id = fields.Many2one("res.company", readonly=True, index=True)
+    currency_id = fields.Many2one(related="company_id.currency_id")
+    location_id = fields.Many2one("stock.location", readonly=True)
+    warehouse_id = fields.Many2one("stock.warehouse", readonly=True)
+    product_id = fields.Many2one("product.product", readonly=True, index=True)
+    categ_id = fields.Many2one(
+        "product.category", string="Product Category", readonly=True, index=True
+    )
+    lot_id = fields.Many2one("stock.lot", string="Lot/Serial Number", readonly=True)
+    inventory_id = fields.Many2one(
+        "stock.inventory", string="Inventory Adjustment", readonly=True
+    )
+    user_id = fields.Many2one("res.users", string="Counted by", readonly=True)
+    quantity = fields.Float(
+        string="Theoretical Quantity",
+        digits="Product Unit of Measure",
+        readonly=True,
+    )
+    counted_quantity = fields.Float(digits="Product Unit of Measure", readonly=True)
+    diff_quantity = fields.Float(
+        string="Difference", digits="Product Unit of Measure", readonly=True
+    )
+    discrepancy_percent = fields.Float(
+        string="Discrepancy percent (%)",
+        digits=(3, 2),
+        aggregator="avg",
+        readonly=True,
+    )
+    discrepancy_threshold = fields.Float(
+        string="Threshold (%)", digits=(3, 2), aggregator="avg", readonly=True
+    )
+    has_over_discrepancy = fields.Boolean(readonly=True)
+    value_impact = fields.Monetary(
+        help="Difference valued at the product cost when the count was applied.",
+        readonly=True,
+    )
+    verification_requested = fields.Boolean(
+        help="A slot verification request was raised for the counted stock.",
+        readonly=True,
+    )
+    is_recount = fields.Boolean(
+        help="The same stock had already been counted before.", readonly=True
+    )
+    days_since_last_count = fields.Integer(
+        aggregator="avg",
+        help="Days elapsed since the previous count of the same stock.",
+        readonly=True,
+    )
+
+    def init(self):
+        create_index(
+            self.env.cr,
+            "stock_inventory_discrepancy_report_stock_idx",
+            self._table,
+            ["location_id", "product_id", "lot_id", "date"],
+        )
+
+    @api.model
+    def _record_counts(self, quants):
+        """Record the counts of the quants about to be applied, in one batch.
+        Quants that were not counted are skipped."""
+        quants = quants.filtered("inventory_quantity_set")
+        if not quants:
+            return self
+        last_count_dates = {
+            (location, product, lot): last_date
+            for location, product, lot, last_date in self.sudo()._read_group(
+                [
+                    ("location_id", "in", quants.location_id.ids),
+                    ("product_id", "in", quants.product_id.ids),
+                ],
+                ["location_id", "product_id", "lot_id"],
+                ["date:max"],
+            )
+        }
+        now = fields.Datetime.now()
+        vals_list = []
+        for quant in quants:
+            last_date = last_count_dates.get(
+                (quant.location_id, quant.product_id, quant.lot_id)
+            )
+            diff_quantity = quant.inventory_diff_quantity
+            product = quant.product_id.with_company(quant.company_id)
+            vals_list.append(
+                {
+                    "date": now,
+                    "company_id": quant.company_id.id,
+                    "location_id": quant.location_id.id,
+                    "warehouse_id": quant.location_id.warehouse_id.id,
+                    "product_id": product.id,
+                    "categ_id": product.categ_id.id,
+                    "lot_id": quant.lot_id.id,
+                    "inventory_id": quant.current_inventory_id.id,
+                    "user_id": quant.user_id.id or self.env.uid,
+                    "quantity": quant.quantity,
+                    "counted_quantity": quant.inventory_quantity,
+                    "diff_quantity": diff_quantity,
+                    "discrepancy_percent": quant.discrepancy_percent,
+                    "discrepancy_threshold": quant.discrepancy_threshold,
+                    "has_over_discrepancy": quant.has_over_discrepancy,
+                    "value_impact": diff_quantity * product.standard_price,
+                    "verification_requested": quant.requested_verification,
+                    "is_recount": bool(last_date),
+                    "days_since_last_count": (now - last_date).days
+                    if last_date
+                    else 0,
+                }
+            )
+        return self.sudo().create(vals_list)
@@ -2,6 +2,8 @@
 #   (http://www.forgeflow.com)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+from dateutil.relativedelta import relativedelta
+
 from odoo.exceptions import AccessError
 from odoo.tests.common import new_test_user
 
@@ -738,3 +740,84 @@ class TestStockVerificationRequest(BaseCommon):
             self.env.uid,
             "Processed By not set correctly after cancel action.",
         )
+
+    def test_11_batch_request_verification(self):
+        """SVRs of several quants are created at once with distinct names."""
+        quants = self.stock_quant_obj.create(
+            [
+                {
+                    "location_id": self.test_loc.id,
+                    "product_id": product.id,
+                    "quantity": 10.0,
+                }
+                for product in self.product1 | self.product2
+            ]
+        )
+        quants.write({"discrepancy_threshold": 0.1, "discrepancy_percent": 0.5})
+        quants.action_request_verification()
+        svrs = self.obj_svr.search([("quant_id", "in", quants.ids)])
+        self.assertEqual(len(svrs), 2)
+        self.assertEqual(len(set(svrs.mapped("name"))), 2)
+        self.assertTrue(all(name.startswith("SVR/") for name in svrs.mapped("name")))
+        self.assertTrue(all(quants.mapped("requested_verification")))
+
+    def test_12_involved_move_lines_window(self):
+        """Involved moves are counted within the date window of the SVR."""
+        move = self.obj_move.create(
+            {
+                "name": "Windowed Move",
+                "product_id": self.product1.id,
+                "product_uom_qty": 3,
+                "product_uom": self.product1.uom_id.id,
+                "location_id": self.test_loc.id,
+                "location_dest_id": self.test_loc.id,
+            }
+        )
+        move._action_confirm()
+        move._action_assign()
+        svr = self.obj_svr.create(
+            {
+                "location_id": self.test_loc.id,
+                "product_id": self.product1.id,
+            }
+        )
+        svr.action_confirm()
+        self.assertEqual(svr.involved_move_line_count, len(move.move_line_ids))
+        action = svr.action_view_move_lines()
+        self.assertIn(("date", ">=", svr.involved_date_from), action["domain"])
+        svr.involved_date_from = move.move_line_ids[0].date + relativedelta(days=1)
+        self.assertEqual(svr.involved_move_line_count, 0)
+        self.assertFalse(svr.involved_move_line_ids)
+
+    def test_13_discrepancy_report(self):
+        """Applied counts are recorded in the discrepancy analysis."""
+        report_model = self.env["stock.inventory.discrepancy.report"]
+        self.product1.standard_price = 2.0
+        quant = self.stock_quant_obj.create(
+            {
+                "location_id": self.test_loc2.id,
+                "product_id": self.product1.id,
+                "quantity": 10.0,
+            }
+        )
+        uncounted_quant = self.stock_quant_obj.create(
+            {
+                "location_id": self.test_loc2.id,
+                "product_id": self.product2.id,
+                "quantity": 5.0,
+            }
+        )
+        for counted_quantity in (8.0, 12.0):
+            quant.inventory_quantity = counted_quantity
+            (quant | uncounted_quant).with_user(
+                self.manager
+            ).action_apply_inventory()
+        lines = report_model.search(
+            [("location_id", "=", self.test_loc2.id)], order="id"
+        )
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines.mapped("diff_quantity"), [-2.0, 4.0])
+        self.assertEqual(lines.mapped("value_impact"), [-4.0, 8.0])
+        self.assertEqual(lines.mapped("discrepancy_percent"), [20.0, 50.0])
+        self.assertEqual(lines.mapped("is_recount"), [False, True])
+        self.assertEqual(lines[0].categ_id, self.product1.categ_id)
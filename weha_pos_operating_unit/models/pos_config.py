@@ -13,6 +13,13 @@ class PosConfig(models.Model):
         help='Operating unit for this POS. All journal entries will be assigned to this operating unit.'
     )
     
+    batch_session_closing = fields.Boolean(
+        string='Batch Session Closing',
+        default=False,
+        help='Create and post all split (customer account) bank payments of a session '
+             'in one batch when closing it, instead of one payment at a time.'
+    )
+    
     @api.onchange('company_id')
     def _onchange_company_id_operating_unit(self):
         """Reset operating unit when company changes"""
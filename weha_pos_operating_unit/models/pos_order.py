@@ -24,22 +24,16 @@ class PosOrder(models.Model):
         return super()._create_invoice(move_vals)
     
     def _create_misc_reversal_move(self, payment_moves):
-        """Override to assign operating unit to reversal entry"""
-        # Store operating unit before calling super
-        operating_unit_id = self.operating_unit_id.id if self.operating_unit_id else False
-        
-        result = super()._create_misc_reversal_move(payment_moves)
-        
-        # Find the reversal entry that was just created and assign operating unit
-        if operating_unit_id:
-            reversal_entry = self.env['account.move'].search([
-                ('ref', 'like', f'Reversal of POS closing entry%{self.name}%')
-            ], limit=1, order='id desc')
-            
-            if reversal_entry:
-                reversal_entry.write({'operating_unit_id': operating_unit_id})
-        
-        return result
+        """Override to assign operating unit to reversal entry
+
+        The operating unit is passed as default value of the moves created
+        by the reversal flow, so the entry gets it at creation instead of
+        being looked up afterwards by its reference.
+        """
+        order = self
+        if self.operating_unit_id:
+            order = self.with_context(default_operating_unit_id=self.operating_unit_id.id)
+        return super(PosOrder, order)._create_misc_reversal_move(payment_moves)
 
 
 class PosPayment(models.Model):
@@ -103,12 +103,63 @@ class PosSession(models.Model):
             lambda line: line.account_id == self._get_receivable_account(payment_method)
         )
 
-    def _create_split_account_payment(self, payment, amounts):
-        """Override to add operating unit to split bank payment"""
+    def _create_bank_payment_moves(self, data):
+        """Create the split bank payments in one batch when batch closing is enabled"""
+        if not self.config_id.batch_session_closing:
+            return super()._create_bank_payment_moves(data)
+
+        # Let the standard flow handle combined payments and payment method
+        # differences, the split payments are created below in one go.
+        split_receivables_bank = data.get('split_receivables_bank')
+        data['split_receivables_bank'] = {}
+        data = super()._create_bank_payment_moves(data)
+        data['split_receivables_bank'] = split_receivables_bank
+
+        if split_receivables_bank:
+            MoveLine = data.get('MoveLine')
+            payments = list(split_receivables_bank)
+            split_receivable_lines = MoveLine.create([
+                self._get_split_receivable_vals(payment, amounts['amount'], amounts['amount_converted'])
+                for payment, amounts in split_receivables_bank.items()
+            ])
+            payment_receivable_lines = self._create_split_account_payments(split_receivables_bank)
+            payment_to_receivable_lines = data['payment_to_receivable_lines']
+            for payment, split_receivable_line in zip(payments, split_receivable_lines):
+                payment_to_receivable_lines[payment] = split_receivable_line | payment_receivable_lines[payment]
+
+        return data
+
+    def _create_split_account_payments(self, split_receivables_bank):
+        """Batch version of _create_split_account_payment
+
+        Create and post the account.payment of every split pos.payment with a
+        single create and a single post, and return the receivable lines of
+        each payment keyed by pos.payment.
+        """
+        receivable_lines = {payment: self.env['account.move.line'] for payment in split_receivables_bank}
+        payments = []
+        vals_list = []
+        for payment, amounts in split_receivables_bank.items():
+            if not payment.payment_method_id.journal_id:
+                continue
+            payments.append(payment)
+            vals_list.append(self._prepare_split_account_payment_vals(payment, amounts))
+        if not vals_list:
+            return receivable_lines
+
+        account_payments = self.env['account.payment'].create(vals_list)
+        account_payments.action_post()
+
+        for payment, account_payment in zip(payments, account_payments):
+            receivable_account = account_payment.partner_id.property_account_receivable_id
+            receivable_lines[payment] = account_payment.move_id.line_ids.filtered(
+                lambda line: line.account_id == receivable_account
+            )
+        return receivable_lines
+
+    def _prepare_split_account_payment_vals(self, payment, amounts):
+        """Values of the account.payment created for a split pos.payment"""
         payment_method = payment.payment_method_id
-        if not payment_method.journal_id:
-            return self.env['account.move.line']
-        
         outstanding_account = payment_method.outstanding_account_id
         accounting_partner = self.env["res.partner"]._find_accounting_partner(payment.partner_id)
         destination_account = accounting_partner.property_account_receivable_id
@@ -134,6 +185,17 @@ class PosSession(models.Model):
         if self.operating_unit_id:
             payment_vals['operating_unit_id'] = self.operating_unit_id.id
         
+        return payment_vals
+
+    def _create_split_account_payment(self, payment, amounts):
+        """Override to add operating unit to split bank payment"""
+        payment_method = payment.payment_method_id
+        if not payment_method.journal_id:
+            return self.env['account.move.line']
+        
+        accounting_partner = self.env["res.partner"]._find_accounting_partner(payment.partner_id)
+        payment_vals = self._prepare_split_account_payment_vals(payment, amounts)
+        
         account_payment = self.env['account.payment'].create(payment_vals)
         account_payment.action_post()
         
@@ -13,3 +13,10 @@ class ResConfigSettings(models.TransientModel):
         readonly=False,
         help='Operating Unit for this Point of Sale'
     )
+
+    pos_batch_session_closing = fields.Boolean(
+        related='pos_config_id.batch_session_closing',
+        string='Batch Session Closing',
+        readonly=False,
+        help='Create and post split bank payments in one batch when closing the session'
+    )
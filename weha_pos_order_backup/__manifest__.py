@@ -11,6 +11,7 @@
         - Sync backup data to server (pos.data.log table)
         - Import missing orders from backup if needed
         - Prevent data loss in case of network issues
+        - Server-driven sync pacing (interval, jitter, batch size)
     """,
     'author': 'Weha',
     'website': 'https://weha-id.com',
@@ -19,6 +20,7 @@
     'data': [
         'security/ir.model.access.csv',
         'views/pos_data_log_views.xml',
+        'views/res_config_settings_views.xml',
     ],
     'assets': {
         'point_of_sale._assets_pos': [
@@ -1,3 +1,5 @@
 # -*- coding: utf-8 -*-
+from . import pos_config
 from . import pos_data_log
 from . import pos_session
+from . import res_config_settings
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from odoo import fields, models
+
+
+class PosConfig(models.Model):
+    _inherit = 'pos.config'
+
+    backup_sync_interval = fields.Integer(
+        string='Backup Sync Interval (s)',
+        default=30,
+        help='Base number of seconds between two backup syncs of a terminal'
+    )
+
+    backup_sync_jitter = fields.Integer(
+        string='Backup Sync Jitter (s)',
+        default=15,
+        help='Random delay added to every sync so terminals do not sync at the same moment'
+    )
+
+    backup_sync_batch_size = fields.Integer(
+        string='Backup Sync Batch Size',
+        default=50,
+        help='Maximum number of backups a terminal sends in one sync'
+    )
+
+    backup_sync_max_per_minute = fields.Integer(
+        string='Max Backups per Minute',
+        default=0,
+        help='Server-wide number of backups per minute above which terminals are slowed down '
+             '(longer interval, smaller batches). 0 disables throttling.'
+    )
@@ -11,7 +11,7 @@ class PosDataLog(models.Model):
     _description = 'POS Data Backup Log'
     _order = 'create_date desc'
 
-    name = fields.Datetime('Sync Date', default=fields.Datetime.now, required=True)
+    name = fields.Datetime('Sync Date', default=fields.Datetime.now, required=True, index=True)
     pos_data = fields.Text('POS Data (JSON)', required=True)
     type = fields.Char('Type', default='order', required=True)
     state = fields.Selection([
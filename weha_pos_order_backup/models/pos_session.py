@@ -1,20 +1,35 @@
 # -*- coding: utf-8 -*-
-from odoo import models, api, _
+from datetime import timedelta
+
+from odoo import fields, models, api, _
+
+# Upper bound for the interval suggested to a throttled terminal, in seconds
+MAX_SYNC_INTERVAL = 600
 
 
 class PosSession(models.Model):
     _inherit = 'pos.session'
 
     @api.model
-    def sync_order_backups(self, backups,):
-        """Sync order backups from POS UI to server"""
+    def sync_order_backups(self, backups, config_id=False):
+        """Sync order backups from POS UI to server
+
+        Only the first ``batch_size`` backups are saved, the others are
+        returned as ``deferred`` so the terminal keeps them for a later sync.
+        The ``pacing`` key tells the terminal when to sync next.
+        """
+        config = self.env['pos.config'].browse(config_id) if config_id else self.env['pos.config']
+        pacing = self._get_backup_sync_pacing(config)
+
         results = {
             'success': [],
             'failed': [],
-            'duplicates': []
+            'duplicates': [],
+            'deferred': [backup.get('uid') for backup in backups[pacing['batch_size']:]],
+            'pacing': pacing,
         }
-        
-        for backup_data in backups:
+
+        for backup_data in backups[:pacing['batch_size']]:
             result = self.env['pos.data.log'].save_order_backup(
                 backup_data
             )
@@ -32,6 +47,40 @@ class PosSession(models.Model):
         
         return results
 
+    @api.model
+    def _get_backup_sync_pacing(self, config):
+        """Compute the sync interval, jitter and batch size for a terminal
+
+        When the server-wide backup rate of the last minute exceeds
+        ``backup_sync_max_per_minute``, the interval is stretched and the
+        batch size shrunk by the overload factor.
+        """
+        config = config.exists()
+        interval = config.backup_sync_interval if config else 30
+        jitter = config.backup_sync_jitter if config else 15
+        batch_size = config.backup_sync_batch_size if config else 50
+        max_per_minute = config.backup_sync_max_per_minute if config else 0
+        interval = max(interval, 1)
+        batch_size = max(batch_size, 1)
+        throttled = False
+
+        if max_per_minute > 0:
+            since = fields.Datetime.now() - timedelta(minutes=1)
+            recent = self.env['pos.data.log'].sudo().search_count([('name', '>=', since)])
+            if recent > max_per_minute:
+                factor = recent / max_per_minute
+                interval = min(int(interval * factor), MAX_SYNC_INTERVAL)
+                jitter = min(int(jitter * factor), MAX_SYNC_INTERVAL)
+                batch_size = max(int(batch_size / factor), 1)
+                throttled = True
+
+        return {
+            'interval': interval,
+            'jitter': max(jitter, 0),
+            'batch_size': batch_size,
+            'throttled': throttled,
+        }
+
     @api.model
     def check_missing_orders(self, session_id, order_uids):
         """Check for missing orders and return backup data if available"""
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from odoo import fields, models
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = 'res.config.settings'
+
+    pos_backup_sync_interval = fields.Integer(
+        related='pos_config_id.backup_sync_interval',
+        readonly=False,
+        string='Backup Sync Interval (s)'
+    )
+
+    pos_backup_sync_jitter = fields.Integer(
+        related='pos_config_id.backup_sync_jitter',
+        readonly=False,
+        string='Backup Sync Jitter (s)'
+    )
+
+    pos_backup_sync_batch_size = fields.Integer(
+        related='pos_config_id.backup_sync_batch_size',
+        readonly=False,
+        string='Backup Sync Batch Size'
+    )
+
+    pos_backup_sync_max_per_minute = fields.Integer(
+        related='pos_config_id.backup_sync_max_per_minute',
+        readonly=False,
+        string='Max Backups per Minute'
+    )
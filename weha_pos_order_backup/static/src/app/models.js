@@ -17,11 +17,38 @@ patch(PosStore.prototype, {
         
         console.log('[Order Backup] Database initialized:', this.orderBackupStorage.dbName);
         
-        // Sync any unsynced backups immediately
-        setTimeout(() => this.syncOrderBackups(), 3000);
-        
-        // Auto sync every 30 seconds
-        this.orderBackupSyncInterval = setInterval(() => this.syncOrderBackups(), 30000);
+        // Pacing is replaced by the one returned by the server after each sync
+        this.orderBackupSyncPacing = {
+            interval: this.config.backup_sync_interval || 30,
+            jitter: this.config.backup_sync_jitter || 15,
+            batch_size: this.config.backup_sync_batch_size || 50,
+        };
+        this.orderBackupSyncFailures = 0;
+
+        // First sync is spread over the jitter window so terminals opened
+        // at the same time do not hit the server together
+        this.scheduleOrderBackupSync(3 + Math.random() * this.orderBackupSyncPacing.jitter);
+    },
+
+    /**
+     * Schedule the next backup sync in `delay` seconds
+     */
+    scheduleOrderBackupSync(delay) {
+        clearTimeout(this.orderBackupSyncTimeout);
+        this.orderBackupSyncTimeout = setTimeout(async () => {
+            await this.syncOrderBackups();
+            this.scheduleOrderBackupSync(this.getNextOrderBackupSyncDelay());
+        }, delay * 1000);
+    },
+
+    /**
+     * Next sync delay in seconds: server interval plus random jitter,
+     * with exponential backoff after failed syncs
+     */
+    getNextOrderBackupSyncDelay() {
+        const { interval, jitter } = this.orderBackupSyncPacing;
+        const backoff = Math.min(2 ** this.orderBackupSyncFailures, 16);
+        return interval * backoff + Math.random() * jitter;
     },
 
     async _flush_orders(orders) {
@@ -43,30 +70,40 @@ patch(PosStore.prototype, {
                 return;
             }
 
-            console.log(`[Order Backup] Syncing ${unsyncedBackups.length} backups to server`);
+            const batch = unsyncedBackups.slice(0, this.orderBackupSyncPacing.batch_size);
+
+            console.log(`[Order Backup] Syncing ${batch.length}/${unsyncedBackups.length} backups to server`);
             console.log('[Order Backup] Session ID:', this.config.current_session_id.id);
 
             const result = await this.data.call(
                 'pos.session',
                 'sync_order_backups',
-                [unsyncedBackups]
+                [batch, this.config.id]
             );
 
+            if (result.pacing) {
+                this.orderBackupSyncPacing = result.pacing;
+                if (result.pacing.throttled) {
+                    console.log('[Order Backup] Server is throttling backup sync:', result.pacing);
+                }
+            }
+            this.orderBackupSyncFailures = 0;
+
             // Mark synced backups
             for (const uid of result.success) {
                 await this.orderBackupStorage.markAsSynced(uid);
             }
 
-            console.log(`[Order Backup] Synced: ${result.success.length}, Failed: ${result.failed.length}, Duplicates: ${result.duplicates.length}`);
+            console.log(`[Order Backup] Synced: ${result.success.length}, Failed: ${result.failed.length}, Duplicates: ${result.duplicates.length}, Deferred: ${result.deferred.length}`);
 
             if (result.failed.length > 0) {
                 console.error('[Order Backup] Failed syncs:', result.failed);
             }
 
         } catch (error) {
+            this.orderBackupSyncFailures++;
             console.error('[Order Backup] Sync error:', error);
-            console.log('[Order Backup] Will retry in 10 seconds...');
-            setTimeout(() => this.syncOrderBackups(), 10000);
+            console.log('[Order Backup] Will retry with backoff, failures:', this.orderBackupSyncFailures);
         }
     },
 